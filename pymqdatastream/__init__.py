@@ -1,4 +1,47 @@
-from .datastream.datastream import *
-from .connectors.test import pymqds_rand as rand
-from .connectors.logger import pymqds_slogger as slogger
-__version__ = datastream.datastream.__datastream_version__
+"""
+pymqdatastream, the names of :mod:`pymqdatastream.datastream.datastream`
+(DataStream, Stream, ...), AsyncDataStream/AsyncStream and the rand and
+slogger connectors are available as attributes of the package. The
+modules are imported when an attribute is used first, importing the
+package (or one of its connectors) does not load zmq, numpy etc.
+"""
+import os
+import importlib
+
+# The VERSION file is installed as package data
+with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'VERSION')) as version_file:
+    __version__ = version_file.read().strip()
+
+# Attributes which are not in the datastream module, name:(module,attribute)
+_lazy_attributes = {'AsyncDataStream':('.datastream.datastream_asyncio', 'AsyncDataStream'),
+                    'AsyncStream':('.datastream.datastream_asyncio', 'AsyncStream'),
+                    'rand':('.connectors.test.pymqds_rand', None),
+                    'slogger':('.connectors.logger.pymqds_slogger', None)}
+
+
+def __getattr__(name):
+    """ Imports the module of the attribute name when it is used first (PEP 562)
+    """
+    if(name.startswith('__')):
+        raise AttributeError(name)
+
+    if(name in _lazy_attributes):
+        [module_name, attribute] = _lazy_attributes[name]
+        module = importlib.import_module(module_name, __name__)
+        value = module if attribute == None else getattr(module, attribute)
+    else:
+        datastream = importlib.import_module('.datastream.datastream', __name__)
+        if(name in globals()): # A subpackage, set by the import
+            return globals()[name]
+        try:
+            value = getattr(datastream, name)
+        except AttributeError:
+            raise AttributeError("module '" + __name__ + "' has no attribute '" + name + "'")
+
+    globals()[name] = value # Next time the attribute is found without __getattr__
+    return value
+
+
+def __dir__():
+    datastream = importlib.import_module('.datastream.datastream', __name__)
+    return sorted(set(globals()) | set(_lazy_attributes) | set(dir(datastream)))
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""
+Polls the throughput and latency statistic ({'get':'stats'}) of all
+datastreams found and prints a table with one line per stream. Streams
+received by a datastream show the latency (tr - ts) of the hop from the
+publisher to this datastream, following a chain of datastreams shows
+which hop is slow.
+"""
+import sys
+import time
+import logging
+import argparse
+import pymqdatastream
+
+logging.basicConfig(stream=sys.stderr, level=logging.INFO)
+logger = logging.getLogger('pydatastream_stats')
+logger.setLevel(logging.INFO)
+
+
+def format_stats(stats):
+    """
+    Returns a list of table lines of the statistic of a datastream
+    """
+    lines = []
+    for stream_stats in stats['Streams']:
+        if(stream_stats['stream_type'] not in ('pubstream','substream')):
+            continue
+
+        line = '{:>20s} {:>3d} {:>20s} {:>5s}'.format(stats['name'][:20], stream_stats['number'], stream_stats['name'][:20], stream_stats['stream_type'][:5])
+        line += ' {:>10.1f} {:>12.1f}'.format(stream_stats.get('packets_per_s', 0), stream_stats.get('bytes_per_s', 0))
+        if('latency' in stream_stats):
+            latency = stream_stats['latency']
+            line += ' {:>9.3f} {:>9.3f} {:>9.3f}'.format(latency['p50'] * 1e3, latency['p99'] * 1e3, latency['max'] * 1e3)
+        else:
+            line += ' {:>9s} {:>9s} {:>9s}'.format('-', '-', '-')
+
+        if('queue' in stream_stats):
+            line += ' {:>7d} {:>7d} {:>7d}'.format(stream_stats['packets_lost'], stream_stats['queue']['dropped'], stream_stats['queue']['packets'])
+        else:
+            line += ' {:>7s} {:>7s} {:>7s}'.format('-', '-', '-')
+
+        lines.append(line)
+
+    return lines
+
+
+def main():
+    datastream_help = 'Query datastreams at address e.g. -d tcp://192.168.178.97, several -d are possible'
+    registry_help = 'Find the datastreams with the registry at address (e.g. ' + pymqdatastream.standard_datastream_registry_address + ')'
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--verbose', '-v', action='count')
+    parser.add_argument('--datastream', '-d', nargs = '?', default = [], action='append', help=datastream_help)
+    parser.add_argument('--registry', '-r', default = None, help = registry_help)
+    parser.add_argument('--interval', '-i', type = float, default = 2.0, help = 'Time in seconds between two polls')
+    parser.add_argument('--count', '-n', type = int, default = 0, help = 'Number of polls, 0 polls until interrupted')
+    args = parser.parse_args()
+    if(args.verbose == None):
+        logging_level = logging.CRITICAL
+    elif(args.verbose == 1):
+        logging_level = logging.INFO
+    else:
+        logging_level = logging.DEBUG
+
+    logger.setLevel(logging_level)
+    address = None
+    if(len(args.datastream) != 0):
+        address = args.datastream
+
+    Datastream = pymqdatastream.DataStream(name = 'stats', logging_level = logging_level, registry = args.registry)
+    datastreams_remote = Datastream.query_datastreams_fast(address)
+    print('Found ' + str(len(datastreams_remote)) + ' datastreams')
+    header = '{:>20s} {:>3s} {:>20s} {:>5s} {:>10s} {:>12s} {:>9s} {:>9s} {:>9s} {:>7s} {:>7s} {:>7s}'.format('datastream','#','stream','type','packets/s','bytes/s','p50 [ms]','p99 [ms]','max [ms]','lost','dropped','queue')
+    npoll = 0
+    try:
+        while((args.count == 0) or (npoll < args.count)):
+            print('\n' + time.strftime('%Y-%m-%d %H:%M:%S'))
+            print(header)
+            for datastream_remote in datastreams_remote:
+                [ret,stats] = Datastream.get_datastream_stats(datastream_remote.address)
+                if(ret):
+                    for line in format_stats(stats):
+                        print(line)
+                else:
+                    print('{:>20s} no reply from {:s}'.format(datastream_remote.name[:20], datastream_remote.address))
+
+            npoll += 1
+            if((args.count == 0) or (npoll < args.count)):
+                time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+
+    Datastream.close()
+
+
+if __name__ == '__main__':
+    main()
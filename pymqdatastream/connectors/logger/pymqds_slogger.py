@@ -108,11 +108,9 @@ class LoggerDataStream(pymqdatastream.DataStream):
         self.logger.debug(funcname)
         new_subscription = True
         #stream = None
-        for sub_stream in self.Streams:
-            if( stream == sub_stream ):
-                new_subscription = False
-                self.logger.debug(funcname + ': stream has already been subscribed')
-                break
+        if(self.has_stream(stream)):
+            new_subscription = False
+            self.logger.debug(funcname + ': stream has already been subscribed')
             
         if(new_subscription):
             self.logger.debug('log_stream(): subscribing to stream')
@@ -61,10 +61,11 @@ class NMEA0183DataStream(pymqdatastream.DataStream):
         self.NMEA0183grabber.add_tcp_stream(address,port)
         
 
-    def add_raw_NMEA_stream(self):
+    def add_raw_NMEA_stream(self, compression = None):
         """
 
-
+        Args:
+            compression: The codec compressing the NMEA data, e.g. 'zlib' for satellite or radio links, see :class:`pymqdatastream.Stream` [default=None]
 
         """
         
@@ -74,7 +75,7 @@ class NMEA0183DataStream(pymqdatastream.DataStream):
         nmeavar = pymqdatastream.StreamVariable(name = 'NMEA0183',unit = '',datatype = 'pymqds_NMEA0183 raw data dict')
         variables = [nmeavar,]
         name = 'raw NMEA0183'
-        stream = self.add_pub_stream(socket = self.sockets[-1],name=name,variables=variables)
+        stream = self.add_pub_stream(socket = self.sockets[-1],name=name,variables=variables,compression=compression)
         NMEA_thread = threading.Thread(target=self.push_raw_NMEA_data,args = (stream,self.deques[-1]))
         self.thread.append(NMEA_thread)
         self.thread[-1].daemon = True
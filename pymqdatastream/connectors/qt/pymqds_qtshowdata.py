@@ -23,14 +23,14 @@ logger.setLevel(logging.DEBUG)
 
 
 class qtshowstreamdataWidget(QtWidgets.QWidget):
-    def __init__(self,logging_level=logging.INFO):
+    def __init__(self,logging_level=logging.INFO,latest=False):
         QtWidgets.QWidget.__init__(self)        
         self.setMinimumSize(QtCore.QSize(500, 500))
         self.Datastream = pymqdatastream.DataStream(name='qtshowstreamdata',logging_level=logging_level)
         list_status = []
         # Datastream stuff
         #self.DatastreamChoose = DataStreamChooseShowWidget(self.Datastream, hide_myself=True)
-        self.DatastreamChoose = datastream_qt_service.DataStreamSubscribeWidget(self.Datastream, hide_myself=True, stream_type = 'pubstream')
+        self.DatastreamChoose = datastream_qt_service.DataStreamSubscribeWidget(self.Datastream, hide_myself=True, stream_type = 'pubstream', conflate = latest)
         #self.DatastreamChoose.query_datastreams(self.DatastreamChoose.address_list)
         #self.DatastreamChoose.handle_update_clicked()
         self.showwidgets = []
@@ -75,7 +75,7 @@ class qtshowstreamdataWidget(QtWidgets.QWidget):
 
 
 class qtshowstreamdataMainWindow(QtWidgets.QMainWindow):
-    def __init__(self,logging_level=logging.INFO):
+    def __init__(self,logging_level=logging.INFO,latest=False):
         QtWidgets.QMainWindow.__init__(self)
         print('Hallo')
         mainMenu = self.menuBar()
@@ -96,7 +96,7 @@ class qtshowstreamdataMainWindow(QtWidgets.QMainWindow):
         
         self.statusBar()
 
-        self.qtshowstreamdatawidget = qtshowstreamdataWidget(logging_level=logging_level)
+        self.qtshowstreamdatawidget = qtshowstreamdataWidget(logging_level=logging_level,latest=latest)
         self.setCentralWidget(self.qtshowstreamdatawidget)
         
         self.show()
@@ -117,6 +117,7 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--verbose', '-v', action='count')
     parser.add_argument('--datastream', '-d', nargs = '?', default = False, help=datastream_help)    
+    parser.add_argument('--latest', '-l', action='store_true', help='Show only the newest packet of the streams (conflating subscription)')
     args = parser.parse_args()
     logging_level = logging.INFO
     if(args.verbose == None):
@@ -141,7 +142,7 @@ def main():
             logger.debug('Connecting to pymqdatastream at address: ' + str(args.datastream))
     
     app = QtWidgets.QApplication(sys.argv)
-    window = qtshowstreamdataMainWindow(logging_level = logging_level)
+    window = qtshowstreamdataMainWindow(logging_level = logging_level, latest = args.latest)
     window.show()
     sys.exit(app.exec_())
 
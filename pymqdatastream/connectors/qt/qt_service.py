@@ -210,8 +210,9 @@ class DataStreamSubscribeWidget(QtWidgets.QWidget):
         update_subscribed_streams: update the subscribed streams, useful in combination with show_statistics = True
         stream_type: Types of streams to show (subscription is still only to pubstreams)
         multiple_subscription: Allows to subscribe a stream more than once [default True]
+        conflate: Subscribe conflating streams, which keep only the newest packet, for widgets showing the latest value only, see :func:`pymqdatastream.DataStream.subscribe_stream` [default False]
     """
-    def __init__(self,Datastream,hide_myself = False, show_statistics = False, update_subscribed_streams = False, stream_type = None, multiple_subscription=True, statistic=True):
+    def __init__(self,Datastream,hide_myself = False, show_statistics = False, update_subscribed_streams = False, stream_type = None, multiple_subscription=True, statistic=True, conflate=False):
         QtWidgets.QWidget.__init__(self)
         funcname = self.__class__.__name__ + '.__init__()'
         logger.debug(funcname)
@@ -219,6 +220,7 @@ class DataStreamSubscribeWidget(QtWidgets.QWidget):
         self.layout = QtWidgets.QGridLayout(self)
         self.show_statistics = show_statistics
         self._statistic = statistic
+        self._conflate = conflate
         self.update_subscribed_streams = update_subscribed_streams
         self.multiple_subscription = multiple_subscription
         if( not(isinstance(stream_type,list))) :
@@ -298,6 +300,10 @@ class DataStreamSubscribeWidget(QtWidgets.QWidget):
 
 
         self.unsubscribe_item = None
+        # The scanner for datastreams, polled by the scan timer
+        self.scanner = None
+        self.scan_timer = QtCore.QTimer(self)
+        self.scan_timer.timeout.connect(self.poll_scanner)
 
         # Fill the list with datastream objects
         #remote_datastreams = self.query_datastreams(self.address_list[0:2])
@@ -496,7 +502,7 @@ class DataStreamSubscribeWidget(QtWidgets.QWidget):
         '''
         funcname = self.__class__.__name__ + '.handle_subscribe_clicked()'
             
-        substream = self.Datastream.subscribe_stream(self._subscribe_item.stream,statistic=self._statistic)
+        substream = self.Datastream.subscribe_stream(self._subscribe_item.stream,statistic=self._statistic,conflate=self._conflate)
         if(substream != None):
             logger.debug(funcname + ': Could connect to socket')
             self.populate_subscribed_with_streams()
@@ -537,9 +543,20 @@ class DataStreamSubscribeWidget(QtWidgets.QWidget):
             print('Got data:',self.address_list)
         except Exception as e:
             print(funcname + ':' + str(e) + ', no addresslistwidget')
-        # Fill the list with datastream objects
-        remote_datastreams = self.Datastream.query_datastreams_fast(self.address_list)
-        self.populate_with_datastreams(remote_datastreams)
+        # Fill the list with datastream objects as they are found
+        if(self.scanner is not None):
+            self.scanner.close()
+        self.scanner = self.Datastream.create_scanner(self.address_list)
+        self.scan_timer.start(20)
+
+    def poll_scanner(self):
+        """ Called by self.scan_timer, adds newly found datastreams to the tree
+        """
+        if(len(self.scanner.poll()) > 0):
+            self.populate_with_datastreams(self.scanner.datastreams)
+
+        if(self.scanner.finished):
+            self.scan_timer.stop()
 
     def handle_close_clicked(self):
         self.close()
@@ -652,10 +669,19 @@ class DataStreamShowTableDataWidget(QtWidgets.QWidget):
     
     This widget displays the data of a subscribed stream in a table widget
 
+    Args:
+        stream: The subscribed stream
+        blockcount:
+        latest: Show only the rows of the newest packet (see :func:`pymqdatastream.Stream.peek_latest`) instead of appending all packets, None uses latest for conflating streams [default None]
+
     """
-    def __init__(self,stream, blockcount = 20000):
+    def __init__(self,stream, blockcount = 20000, latest = None):
         QtWidgets.QWidget.__init__(self)
         self.blockcount = blockcount
+        if(latest == None):
+            latest = stream.conflate
+        self.latest = latest
+        self.n_latest = None # The number of the packet shown in latest mode
         
         # Widgets
         self.stream_data = QtWidgets.QPlainTextEdit()
@@ -725,6 +751,10 @@ class DataStreamShowTableDataWidget(QtWidgets.QWidget):
         
     def read_data(self):
         # Load data and plot
+        if(self.latest):
+            self.read_latest_data()
+            return
+
         while(len(self.stream.deque) > 0):
             data = self.stream.deque.pop()
             sendtime = data['info']['ts']
@@ -750,5 +780,22 @@ class DataStreamShowTableDataWidget(QtWidgets.QWidget):
 
         #self.stream_data.verticalScrollBar().setValue(self.stream_data.verticalScrollBar().maximum())
 
+
+    def read_latest_data(self):
+        """ Shows the rows of the newest packet, the cost does not depend on the packet rate
+        """
+        data = self.stream.peek_latest()
+        if((data == None) or (data['info']['n'] == self.n_latest)):
+            return
+
+        self.n_latest = data['info']['n']
+        self.stream_table.setRowCount(len(data['data']))
+        for i,d in enumerate(data['data']):
+            self.stream_table.setItem(i, 0, QtWidgets.QTableWidgetItem( str(data['info']['n']) ))
+            self.stream_table.setItem(i, 1, QtWidgets.QTableWidgetItem( str(data['info']['ts']) ))
+            self.stream_table.setItem(i, 2, QtWidgets.QTableWidgetItem( str(data['info']['tr']) ))
+            for j,dat in enumerate(d):
+                self.stream_table.setItem(i, 3+j, QtWidgets.QTableWidgetItem( str(dat) ))
+
         
         
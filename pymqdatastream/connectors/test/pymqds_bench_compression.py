@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the compression codecs of pymqdatastream on recorded TODL
+and NMEA data. The data is split into packets as the raw TODL stream
+and the raw NMEA stream publish them, serialised with ubjson and
+compressed with every available codec (see
+:mod:`pymqdatastream.datastream.compression`). The compression ratio,
+the compression and decompression throughput and the packets per second
+which fit through a link with the given bandwidth (e.g. a satellite
+link) are printed.
+
+Single NMEA sentences are smaller than the default compression
+threshold and are sent uncompressed, use -s to combine several
+sentences into one packet.
+"""
+import os
+import time
+import argparse
+import functools
+from pymqdatastream.datastream import serialiser
+from pymqdatastream.datastream import compression
+
+todl_file_default = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'todl', 'data', 'data_test_format4.bin')
+
+
+def nmea_checksum(sentence):
+    """ Returns the checksum (two hex digits) of the NMEA sentence without $ and *
+    """
+    return '{:02X}'.format(functools.reduce(lambda c, x: c ^ ord(x), sentence, 0))
+
+
+def create_nmea_sentences(num_sentences = 1000):
+    """ Creates GGA, RMC and VTG sentences of a ship steaming eastwards,
+    used if no recorded NMEA file is given
+    """
+    sentences = []
+    t0 = time.mktime((2020, 5, 25, 12, 0, 0, 0, 0, 0))
+    for i in range(num_sentences // 3):
+        tstr = time.strftime('%H%M%S', time.gmtime(t0 + i)) + '.00'
+        lon = 1205.1234 + i * 0.0011
+        gga = 'GPGGA,{:s},5410.8312,N,0{:09.4f},E,1,09,0.9,12.3,M,40.1,M,,'.format(tstr, lon)
+        rmc = 'GPRMC,{:s},A,5410.8312,N,0{:09.4f},E,10.2,90.1,250520,,,A'.format(tstr, lon)
+        vtg = 'GPVTG,90.1,T,,M,10.2,N,18.9,K,A'
+        for s in (gga, rmc, vtg):
+            sentences.append('$' + s + '*' + nmea_checksum(s) + '\r\n')
+
+    return sentences
+
+
+def read_nmea_sentences(filename):
+    """ Reads the sentences of a recorded NMEA file (one sentence per line)
+    """
+    sentences = []
+    with open(filename, 'r', errors = 'replace') as f:
+        for line in f:
+            if(line.startswith('$') or line.startswith('!')):
+                sentences.append(line.rstrip('\r\n') + '\r\n')
+
+    return sentences
+
+
+def create_todl_packets(filename, chunk_size = 512):
+    """ Splits a recorded TODL binary file into packets of raw serial
+    data as published by the raw data stream of pymqds_todl
+    """
+    with open(filename, 'rb') as f:
+        data = f.read()
+
+    return [[data[i:i + chunk_size]] for i in range(0, len(data), chunk_size)]
+
+
+def create_nmea_packets(sentences, sentences_per_packet = 1):
+    """ Packets of the raw NMEA stream, a list of nmea data dicts
+    """
+    packets = []
+    ti = time.time()
+    for i in range(0, len(sentences), sentences_per_packet):
+        packet = []
+        for j, sentence in enumerate(sentences[i:i + sentences_per_packet]):
+            packet.append([{'time':ti + i + j, 'device':'/dev/ttyUSB0', 'nmea':sentence}])
+        packets.append(packet)
+
+    return packets
+
+
+def bench_codec(codec, frames_packets, threshold):
+    """
+    Returns:
+       [nbytes, nbytes_compressed, mb_s_compress, mb_s_decompress, ncompressed]: the size of the serialised packets before and after compression, the throughput of compression and decompression in MB/s and the number of packets which were sent compressed (bigger than threshold and smaller after compression)
+    """
+    nbytes = 0
+    nbytes_compressed = 0
+    ncompressed = 0
+    compressed = []
+    t0 = time.perf_counter()
+    for frames in frames_packets:
+        nbytes_packet = sum([len(f) for f in frames])
+        nbytes += nbytes_packet
+        if((codec is None) or (nbytes_packet < threshold)):
+            nbytes_compressed += nbytes_packet
+            continue
+
+        frames_compressed = [codec.compress(f) for f in frames]
+        nbytes_packet_compressed = sum([len(f) for f in frames_compressed])
+        if(nbytes_packet_compressed < nbytes_packet):
+            nbytes_compressed += nbytes_packet_compressed
+            compressed.append(frames_compressed)
+            ncompressed += 1
+        else:
+            nbytes_compressed += nbytes_packet
+
+    t1 = time.perf_counter()
+    for frames in compressed:
+        [codec.decompress(f) for f in frames]
+
+    t2 = time.perf_counter()
+    mb_s_compress = nbytes / 1e6 / (t1 - t0) if (ncompressed > 0) else float('nan')
+    mb_s_decompress = sum([len(f) for frames in compressed for f in frames]) / 1e6 / (t2 - t1) if (len(compressed) > 0) else float('nan')
+    return [nbytes, nbytes_compressed, mb_s_compress, mb_s_decompress, ncompressed]
+
+
+def print_results(title, packets, threshold, link_bits_s):
+    s = serialiser.get_serialiser('ubjson')
+    frames_packets = [s.dumps(packet) for packet in packets]
+    print('\n' + title + ': ' + str(len(packets)) + ' packets, compression threshold ' + str(threshold) + ' bytes')
+    print('{:>8s} {:>10s} {:>10s} {:>7s} {:>12s} {:>12s} {:>10s} {:>14s}'.format('codec','bytes','compr.','ratio','compr. MB/s','decomp. MB/s','compr. #','packets/s link'))
+    for name in ['none'] + compression.get_codecs():
+        codec = compression.get_codec(name)
+        [nbytes, nbytes_compressed, mb_s_compress, mb_s_decompress, ncompressed] = bench_codec(codec, frames_packets, threshold)
+        packets_s_link = link_bits_s / 8 / (nbytes_compressed / len(packets))
+        print('{:>8s} {:10d} {:10d} {:7.2f} {:12.1f} {:12.1f} {:10d} {:14.1f}'.format(name, nbytes, nbytes_compressed, nbytes / nbytes_compressed, mb_s_compress, mb_s_decompress, ncompressed, packets_s_link))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--todl', '-t', default = todl_file_default, help = 'Recorded TODL binary file [default: the test file of the todl connector]')
+    parser.add_argument('--nmea', '-n', default = None, help = 'Recorded NMEA file with one sentence per line, default: generated GGA/RMC/VTG sentences')
+    parser.add_argument('--chunk_size', '-c', type = int, default = 512, help = 'Bytes of raw TODL data per packet')
+    parser.add_argument('--sentences', '-s', type = int, default = 10, help = 'NMEA sentences per packet')
+    parser.add_argument('--threshold', '-m', type = int, default = compression.default_compression_threshold, help = 'Packets with less bytes are not compressed')
+    parser.add_argument('--link', '-l', type = float, default = 9600, help = 'Bandwidth of the link in bit/s for the packets/s column')
+    args = parser.parse_args()
+
+    print_results('TODL ' + os.path.basename(args.todl), create_todl_packets(args.todl, args.chunk_size), args.threshold, args.link)
+    if(args.nmea == None):
+        sentences = create_nmea_sentences()
+        nmea_title = 'NMEA (generated)'
+    else:
+        sentences = read_nmea_sentences(args.nmea)
+        nmea_title = 'NMEA ' + os.path.basename(args.nmea)
+
+    print_results(nmea_title + ', ' + str(args.sentences) + ' sentences per packet', create_nmea_packets(sentences, args.sentences), args.threshold, args.link)
+    print_results(nmea_title + ', 1 sentence per packet', create_nmea_packets(sentences, 1), args.threshold, args.link)
+
+
+if __name__ == '__main__':
+    main()
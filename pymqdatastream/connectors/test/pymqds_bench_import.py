@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Import time benchmark of pymqdatastream and its command line tools.
+Every module is imported in a fresh python process (num_runs times, the
+fastest run is taken), the time of the import and of the whole process
+(python startup included) are compared to a budget. The heavy modules
+loaded by the import are listed, the package itself loads the core
+(zmq) only when pymqdatastream.DataStream etc. are used. Returns 1 if
+a module exceeds its budget, so the script can be used in a CI job.
+"""
+import sys
+import time
+import argparse
+import subprocess
+
+# module or 'module:attribute', budget of the import in seconds
+standard_modules = [('pymqdatastream', 0.05),
+                    ('pymqdatastream:DataStream', 0.3),
+                    ('pymqdatastream.connectors.basic.pymqds_scan', 0.3),
+                    ('pymqdatastream.connectors.basic.pymqds_stats', 0.3),
+                    ('pymqdatastream.connectors.todl.ltc2442', 0.5),
+                    ('pymqdatastream.connectors.todl.pymqds_todl', 0.9)]
+
+heavy_modules = ['zmq', 'numpy', 'ubjson', 'asyncio', 'multiprocessing.shared_memory', 'pkg_resources', 'netCDF4', 'serial']
+
+code_template = """
+import time, sys
+t0 = time.perf_counter()
+import {module}
+{attribute}
+t1 = time.perf_counter()
+print(t1 - t0)
+print(' '.join([m for m in {heavy} if m in sys.modules]))
+"""
+
+
+def bench_import(name, num_runs = 3):
+    """
+    Returns:
+       [timport, tprocess, loaded]: the fastest import time, the fastest process time and the heavy modules loaded
+    """
+    if(':' in name):
+        [module, attribute] = name.split(':')
+        attribute = module + '.' + attribute
+    else:
+        [module, attribute] = [name, '']
+
+    code = code_template.format(module = module, attribute = attribute, heavy = repr(heavy_modules))
+    timport = None
+    tprocess = None
+    loaded = ''
+    for i in range(num_runs):
+        t0 = time.perf_counter()
+        proc = subprocess.run([sys.executable, '-c', code], stdout = subprocess.PIPE, stderr = subprocess.PIPE)
+        t1 = time.perf_counter()
+        if(proc.returncode != 0):
+            return [None, None, proc.stderr.decode('utf-8').strip().split('\n')[-1]]
+
+        lines = proc.stdout.decode('utf-8').split('\n')
+        timport = float(lines[-3]) if timport == None else min(timport, float(lines[-3]))
+        tprocess = (t1 - t0) if tprocess == None else min(tprocess, t1 - t0)
+        loaded = lines[-2]
+
+    return [timport, tprocess, loaded]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--num_runs', '-n', type = int, default = 3, help = 'Number of imports per module, the fastest is taken')
+    parser.add_argument('--module', '-m', action = 'append', default = [], help = 'Module (or module:attribute) to benchmark instead of the standard modules, several -m are possible')
+    parser.add_argument('--budget', '-b', type = float, default = None, help = 'Budget of the import time in seconds, overrides the standard budgets')
+    args = parser.parse_args()
+    if(len(args.module) > 0):
+        modules = [(module, 1.0) for module in args.module]
+    else:
+        modules = standard_modules
+
+    failed = False
+    print('{:>45s} {:>10s} {:>10s} {:>10s} {:>6s}  {:s}'.format('module','import [s]','total [s]','budget [s]','','loaded'))
+    for [module, budget] in modules:
+        if(args.budget != None):
+            budget = args.budget
+
+        [timport, tprocess, loaded] = bench_import(module, args.num_runs)
+        if(timport == None):
+            print('{:>45s} failed: {:s}'.format(module, loaded))
+            continue
+
+        ok = timport <= budget
+        failed = failed or not(ok)
+        print('{:>45s} {:10.3f} {:10.3f} {:10.3f} {:>6s}  {:s}'.format(module[-45:], timport, tprocess, budget, 'ok' if ok else 'SLOW', loaded))
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Cost of reliable streams (see :mod:`pymqdatastream.datastream.reliable`)
+compared to plain pubstreams. Packets of raw bytes of chunk_size bytes,
+as published by the raw data stream of pymqds_todl, are sent over tcp
+to a substream in the same process:
+
+   * throughput: num_packets packets are published as fast as possible, the received packets per second and MB/s are printed, lost packets show when the high water mark was reached (pubstream) and retransmitted packets how often the reliable stream had to send again
+   * latency: num_packets packets are published with rate packets per second, the median and the 99th percentile of the time between sending and receiving are printed
+
+"""
+import time
+import argparse
+import numpy as np
+import pymqdatastream
+
+
+def create_streams(reliable, window = 1000):
+    datastream_pub = pymqdatastream.DataStream(name = 'bench_pub', logging_level = 'CRITICAL')
+    datastream_sub = pymqdatastream.DataStream(name = 'bench_sub', logging_level = 'CRITICAL')
+    address = pymqdatastream.treat_address('tcp://127.0.0.1', control = False)
+    if(reliable):
+        socket = datastream_pub.add_reliable_socket(address = address, window = window, bind_local = False)
+    else:
+        socket = datastream_pub.add_pub_socket(address = address, bind_local = False)
+
+    rawvar = pymqdatastream.StreamVariable(name = 'serial binary', unit = '', datatype = 'b')
+    pubstream = datastream_pub.add_pub_stream(socket, name = 'bench raw', variables = [rawvar])
+    substream = datastream_sub.subscribe_stream(pubstream, statistic = True, queuelen = -1)
+    time.sleep(0.5) # Let the subscription settle
+    return [datastream_pub, datastream_sub, pubstream, substream]
+
+
+def wait_received(substream, num_packets, dt_timeout = 2.0):
+    """ Waits until all packets arrived or nothing arrives anymore
+
+    Returns:
+       [packets_received, t]: the received packets and the time the last one arrived
+    """
+    packets_received = -1
+    tlast = time.perf_counter()
+    while((substream.socket.statistic['packets_received'] < num_packets) and ((time.perf_counter() - tlast) < dt_timeout)):
+        if(substream.socket.statistic['packets_received'] != packets_received):
+            packets_received = substream.socket.statistic['packets_received']
+            tlast = time.perf_counter()
+
+        time.sleep(0.001)
+
+    return [substream.socket.statistic['packets_received'], tlast]
+
+
+def get_retransmitted(pubstream):
+    stats = pubstream.get_stats()
+    return stats['reliable']['retransmitted'] if ('reliable' in stats) else 0
+
+
+def bench_throughput(reliable, num_packets = 10000, chunk_size = 512, window = 1000):
+    """
+    Returns:
+       [packets_received, dt, nbytes, retransmitted]
+    """
+    [datastream_pub, datastream_sub, pubstream, substream] = create_streams(reliable, window)
+    data = [bytes(np.random.randint(0, 256, chunk_size, dtype = np.uint8))]
+    t0 = time.perf_counter()
+    for i in range(num_packets):
+        pubstream.pub_data(data)
+
+    [packets_received, t1] = wait_received(substream, num_packets)
+    nbytes = substream.socket.statistic['bytes_received']
+    retransmitted = get_retransmitted(pubstream)
+    datastream_sub.close()
+    datastream_pub.close()
+    return [packets_received, t1 - t0, nbytes, retransmitted]
+
+
+def bench_latency(reliable, num_packets = 1000, chunk_size = 512, rate = 1000.0, window = 1000):
+    """
+    Returns:
+       [packets_received, latencies]: the latencies tr - ts in seconds
+    """
+    [datastream_pub, datastream_sub, pubstream, substream] = create_streams(reliable, window)
+    data = [bytes(np.random.randint(0, 256, chunk_size, dtype = np.uint8))]
+    dt = 1.0 / rate
+    tnext = time.perf_counter()
+    for i in range(num_packets):
+        pubstream.pub_data(data)
+        tnext += dt
+        while(time.perf_counter() < tnext):
+            pass
+
+    [packets_received, t1] = wait_received(substream, num_packets)
+    latencies = np.asarray([packet['info']['tr'] - packet['info']['ts'] for packet in substream.pop_data(-1)])
+    datastream_sub.close()
+    datastream_pub.close()
+    return [packets_received, latencies]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--num_packets', '-n', type = int, default = 10000, help = 'Number of packets to publish')
+    parser.add_argument('--chunk_size', '-c', type = int, default = 512, help = 'Bytes of raw data per packet')
+    parser.add_argument('--rate', '-r', type = float, default = 1000.0, help = 'Packets per second of the latency test')
+    parser.add_argument('--window', '-w', type = int, default = 1000, help = 'Window of the reliable stream in packets')
+    args = parser.parse_args()
+
+    print('Throughput, ' + str(args.num_packets) + ' packets of ' + str(args.chunk_size) + ' bytes')
+    print('{:>10s} {:>10s} {:>10s} {:>12s} {:>10s} {:>14s}'.format('stream','received','lost','packets/s','MB/s','retransmitted'))
+    for reliable in (False, True):
+        [packets_received, dt, nbytes, retransmitted] = bench_throughput(reliable, args.num_packets, args.chunk_size, args.window)
+        print('{:>10s} {:10d} {:10d} {:12.0f} {:10.2f} {:14d}'.format('reliable' if reliable else 'pubstream', packets_received, args.num_packets - packets_received, packets_received / dt, nbytes / dt / 1e6, retransmitted))
+
+    num_packets = min(args.num_packets, int(args.rate * 5)) # At most 5 seconds
+    print('\nLatency, ' + str(num_packets) + ' packets with ' + str(args.rate) + ' packets/s')
+    print('{:>10s} {:>10s} {:>14s} {:>14s}'.format('stream','received','median [ms]','p99 [ms]'))
+    for reliable in (False, True):
+        [packets_received, latencies] = bench_latency(reliable, num_packets, args.chunk_size, args.rate, args.window)
+        print('{:>10s} {:10d} {:14.3f} {:14.3f}'.format('reliable' if reliable else 'pubstream', packets_received, np.median(latencies) * 1e3, np.percentile(latencies, 99) * 1e3))
+
+
+if __name__ == '__main__':
+    main()
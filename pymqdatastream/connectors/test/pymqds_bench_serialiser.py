@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Micro benchmark of the serialisers of pymqdatastream. For every
+registered data_format a typical packet is encoded and decoded and the
+time needed per packet is printed in ns.
+"""
+import time
+import argparse
+import numpy as np
+from pymqdatastream.datastream import serialiser
+
+
+def create_test_packet(num_rows = 100, num_variables = 10):
+    """ A TODL like packet, a list of rows with packet number, time and
+    the ADC voltages
+
+    """
+    data = []
+    for n in range(num_rows):
+        data.append([n, time.time()] + list(np.random.rand(num_variables - 2)))
+
+    return data
+
+
+def get_packet_for_format(data_format, data):
+    """ Converts the test packet into the form the serialiser expects
+    """
+    if(data_format == 'ndarray'):
+        return np.asarray(data)
+    elif(data_format == 'raw'):
+        return np.asarray(data).tobytes()
+    else:
+        return data
+
+
+def frames_for_loads(s, frames):
+    """ Serialisers with copy == False get zmq.Frame objects
+    """
+    if(s.copy):
+        return [bytes(f) for f in frames]
+    else:
+        import zmq
+        return [zmq.Frame(f) for f in frames]
+
+
+def bench_serialiser(data_format, data, num_packets = 1000):
+    """
+    Returns:
+       [ns_dumps, ns_loads, nbytes]: ns per packet for encoding and decoding and the size of a packet
+    """
+    s = serialiser.get_serialiser(data_format)
+    packet = get_packet_for_format(data_format, data)
+    t0 = time.perf_counter()
+    for i in range(num_packets):
+        frames = s.dumps(packet)
+
+    t1 = time.perf_counter()
+    nbytes = sum([memoryview(f).nbytes for f in frames])
+    frames = frames_for_loads(s, frames)
+    t2 = time.perf_counter()
+    for i in range(num_packets):
+        s.loads(frames)
+
+    t3 = time.perf_counter()
+    return [(t1 - t0) / num_packets * 1e9, (t3 - t2) / num_packets * 1e9, nbytes]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--num_rows', '-r', type = int, default = 100, help = 'Number of rows per packet')
+    parser.add_argument('--num_variables', '-v', type = int, default = 10, help = 'Number of variables per row')
+    parser.add_argument('--num_packets', '-n', type = int, default = 1000, help = 'Number of packets to encode/decode')
+    args = parser.parse_args()
+
+    data = create_test_packet(args.num_rows, args.num_variables)
+    print('Packet: ' + str(args.num_rows) + ' rows x ' + str(args.num_variables) + ' variables')
+    print('{:>10s} {:>14s} {:>14s} {:>14s} {:>10s}'.format('format','dumps [ns]','loads [ns]','total [ns]','bytes'))
+    for data_format in serialiser.get_data_formats():
+        [ns_dumps, ns_loads, nbytes] = bench_serialiser(data_format, data, args.num_packets)
+        print('{:>10s} {:14.0f} {:14.0f} {:14.0f} {:10d}'.format(data_format, ns_dumps, ns_loads, ns_dumps + ns_loads, nbytes))
+
+
+if __name__ == '__main__':
+    main()
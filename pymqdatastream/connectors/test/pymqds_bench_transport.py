@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark of the zmq transports tcp, ipc and inproc. For
+every transport a pubstream is bound to an address of that transport
+(without the additional local addresses), a substream in the same
+process subscribes and num_packets packets are published as fast as
+possible. The received packets per second and MB/s are printed, the
+number of lost packets shows when the high water mark was reached.
+"""
+import os
+import time
+import tempfile
+import argparse
+import numpy as np
+import zmq
+import pymqdatastream
+
+
+def get_address(transport):
+    if(transport == 'tcp'):
+        return 'tcp://127.0.0.1'
+    elif(transport == 'ipc'):
+        return 'ipc://' + os.path.join(tempfile.gettempdir(), 'pymqds_bench_' + str(os.getpid()))
+    else:
+        return 'inproc://pymqds_bench'
+
+
+def bench_transport(transport, num_packets = 10000, num_rows = 10, data_format = 'ubjson', dt_timeout = 2.0):
+    """
+    Returns:
+       [packets_received, dt, nbytes]: received packets, the time needed and the bytes received
+    """
+    address = pymqdatastream.treat_address(get_address(transport), control = False)
+    datastream_pub = pymqdatastream.DataStream(name = 'bench_pub', logging_level = 'CRITICAL')
+    datastream_sub = pymqdatastream.DataStream(name = 'bench_sub', logging_level = 'CRITICAL')
+    socket = datastream_pub.add_pub_socket(address = address, bind_local = False)
+    variables = [pymqdatastream.StreamVariable('count', '', 'int'), pymqdatastream.StreamVariable('data', '', 'float')]
+    pubstream = datastream_pub.add_pub_stream(socket, name = 'bench', variables = variables, data_format = data_format)
+    substream = datastream_sub.subscribe_stream(pubstream, statistic = True)
+    time.sleep(0.5) # Let the subscription settle
+    if(data_format == 'ndarray'):
+        data = np.random.rand(num_rows, 2)
+    else:
+        data = [[i, 0.5] for i in range(num_rows)]
+
+    t0 = time.perf_counter()
+    for i in range(num_packets):
+        pubstream.pub_data(data)
+
+    # Wait until all packets arrived or nothing arrives anymore
+    packets_received = -1
+    tlast = time.perf_counter()
+    while((substream.socket.statistic['packets_received'] < num_packets) and ((time.perf_counter() - tlast) < dt_timeout)):
+        if(substream.socket.statistic['packets_received'] != packets_received):
+            packets_received = substream.socket.statistic['packets_received']
+            tlast = time.perf_counter()
+            t1 = tlast
+
+        time.sleep(0.001)
+
+    packets_received = substream.socket.statistic['packets_received']
+    nbytes = substream.socket.statistic['bytes_received']
+    datastream_sub.close()
+    datastream_pub.close()
+    return [packets_received, t1 - t0, nbytes]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--num_packets', '-n', type = int, default = 10000, help = 'Number of packets to publish')
+    parser.add_argument('--num_rows', '-r', type = int, default = 10, help = 'Number of rows per packet')
+    parser.add_argument('--data_format', '-f', default = 'ubjson', help = 'The data_format of the stream')
+    args = parser.parse_args()
+
+    transports = ['tcp', 'inproc']
+    if(zmq.has('ipc')):
+        transports.insert(1, 'ipc')
+
+    print('{:>8s} {:>10s} {:>10s} {:>12s} {:>10s}'.format('transport','received','lost','packets/s','MB/s'))
+    for transport in transports:
+        [packets_received, dt, nbytes] = bench_transport(transport, args.num_packets, args.num_rows, args.data_format)
+        print('{:>8s} {:10d} {:10d} {:12.0f} {:10.2f}'.format(transport, packets_received, args.num_packets - packets_received, packets_received / dt, nbytes / dt / 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -42,7 +42,7 @@ channels.append([0,0,0,+1,-1])
 modes = []
 speeds = []
 modes.append([0,0,0,0,0]) # 0
-speeds.append(NaN)    # 'keep previous resolution'
+speeds.append(nan)    # 'keep previous resolution'
 # No latency modes
 modes.append([0,0,0,1,0]) # 2
 speeds.append(3.52e3)
@@ -86,31 +86,29 @@ speeds.append(27.5)
 modes.append([1,1,1,1,1]) # 31
 speeds.append(13.73)
 
-# Create int numbers from the bit pattern defined
-modesb = []
-for m in modes:
+def bits_to_int(bits):
+    """ Converts a bit pattern (MSB first, e.g. [OSR3,OSR2,OSR1,OSR0,TWOX]) into an int
+    """
     mb = 0
-    for n,i in enumerate(m):
+    for n,i in enumerate(bits):
         if(i):
-            mb += i<<(4-n)
+            mb += i<<(len(bits)-1-n)
 
-    modesb.append(mb)
-        
-print('Modesb',modesb)
+    return mb
 
-addressb = []
-for m in address:
-    mb = 0
-    for n,i in enumerate(m):
-        if(i):
-            mb += i<<(4-n)
-
-    addressb.append(mb)
-        
-print('Address',addressb)
 
+# Create int numbers from the bit pattern defined
+modesb = [bits_to_int(m) for m in modes]
+addressb = [bits_to_int(m) for m in address]
 modes = asarray(modes)
 
+
+def print_bit_patterns():
+    """ Prints the int numbers of the mode and address bit patterns
+    """
+    print('Modesb',modesb)
+    print('Address',addressb)
+
 def random_data():
     rand_number = np.random.bytes(4)
     return rand_number
@@ -435,5 +433,6 @@ def convert_binary_fast(ad_raw,ref_voltage=5.0,Voff = 0, Vlarge = 9.9999, Vsmall
 
 if __name__ == '__main__':
 
+    print_bit_patterns()
     test_convert_binary()
 
@@ -54,15 +54,9 @@ import importlib
 import pymqdatastream.connectors.nmea.pymqds_nmea0183_gui as pymqds_nmea0183_gui
 
 # Get a standard configuration
-from pkg_resources import Requirement, resource_filename
-filename = resource_filename(Requirement.parse('pymqdatastream'),'pymqdatastream/connectors/todl/todl_config.yaml')
-filename_version = resource_filename(Requirement.parse('pymqdatastream'),'pymqdatastream/VERSION')
-
-
-with open(filename_version) as version_file:
-    version = version_file.read().strip()
-
-print(filename_version)
+# The configuration is installed as package data next to this file
+filename = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'todl_config.yaml')
+from pymqdatastream import __version__ as version
 print(version)    
 
 with open(filename) as config_file:
@@ -860,7 +854,7 @@ class todlDevice():
         # 1 logger at a serial port open
         self.todl = pymqds_todl.todlDataStream(logging_level=logging_level)
         # Add a deque for raw serial data
-        self.todl.deques_raw_serial.append(collections.deque(maxlen=5000))
+        self.todl.deques_raw_serial.append(pymqdatastream.stream_deque(maxlen=5000))
         self.rawdata_deque = self.todl.deques_raw_serial[-1]
         # If the configuration changed call the _update function
         self.todl.init_notification_functions.append(self._update_status_information)
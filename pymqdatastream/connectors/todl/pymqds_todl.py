@@ -878,6 +878,7 @@ class todlDataStream(pymqdatastream.DataStream):
         funcname = self.__class__.__name__ + '.__init__()'
         self.logger.debug(funcname)
         self.dequelen = 10000 # Length of the deque used to store data
+        self.deque_policy = 'drop_oldest' # Overflow policy of the deques, see pymqdatastream.stream_deque
         self.flag_adcs = [] # List of adcs to be send by the logger hardware
         self.device_info = {}
         self.print_serial_data = False
@@ -894,8 +895,8 @@ class todlDataStream(pymqdatastream.DataStream):
         self.packet_statistics['O'] = 0
         self.serial = None # The device to be connected to
         # Two initial queues, the first is for internal use (init logger, query_todl), the second is for the raw stream
-        self.deques_raw_serial = [collections.deque(maxlen=self.dequelen),collections.deque(maxlen=self.dequelen)]
-        self.intraqueue = collections.deque(maxlen=self.dequelen) # Queue for for internal processing, e.g. printing of processed data
+        self.deques_raw_serial = [pymqdatastream.stream_deque(maxlen=self.dequelen, policy=self.deque_policy),pymqdatastream.stream_deque(maxlen=self.dequelen, policy=self.deque_policy)]
+        self.intraqueue = pymqdatastream.stream_deque(maxlen=self.dequelen, policy=self.deque_policy) # Queue for for internal processing, e.g. printing of processed data
         # Two queues to start/stop the raw_data conversion threads
         self.conversion_thread_queue = queue.Queue()
         self.conversion_thread_queue_ans = queue.Queue()
@@ -1193,12 +1194,19 @@ class todlDataStream(pymqdatastream.DataStream):
         self.logger.debug(funcname + ': TODL status:' + str(self.status))
 
 
+    def get_deque_statistic(self):
+        """
+        Returns the fill level and the drop counters of the raw serial data deques, see pymqdatastream.stream_deque.get_statistic()
+        """
+        return [deque.get_statistic() for deque in self.deques_raw_serial]
+
+
     def log_serial_data(self,filename):
         """
         Saves the raw serial data into filename
         """
         funcname = self.__class__.__name__ + '._log_serial_data()'
-        deque = collections.deque(maxlen=self.dequelen)
+        deque = pymqdatastream.stream_deque(maxlen=self.dequelen, policy=self.deque_policy)
         self.deques_raw_serial.append(deque)
         self._log_thread_queue = queue.Queue()
         self._log_thread_queue_ans = queue.Queue()
@@ -1251,12 +1259,14 @@ class todlDataStream(pymqdatastream.DataStream):
                 pass
 
 
-    def add_raw_data_stream(self):
+    def add_raw_data_stream(self, compression = None, reliable = False):
         """
 
         Adds a stream containing the raw data read from todl.
 
-        Args: None
+        Args:
+            compression: The codec compressing the raw data, e.g. 'zlib' for satellite or radio links, see :class:`pymqdatastream.Stream` [default=None]
+            reliable: Publish the stream on a reliable socket, subscribers get lost chunks again instead of a gap in the byte stream (lossy links), see :func:`pymqdatastream.DataStream.add_reliable_socket` [default=False]
 
         Returns:
             raw_stream: the raw data stream
@@ -1269,7 +1279,11 @@ class todlDataStream(pymqdatastream.DataStream):
         variables = ['serial binary',]
         name = 'serial binary'
         famstr = 'todl raw'
-        stream = self.add_pub_stream(socket = self.sockets[-1], name=name, variables=[rawvar], family = famstr)
+        if(reliable):
+            socket = self.add_reliable_socket()
+        else:
+            socket = self.sockets[-1]
+        stream = self.add_pub_stream(socket = socket, name=name, variables=[rawvar], family = famstr, compression = compression)
         self.raw_stream = stream
         self.raw_stream_thread = threading.Thread(target=self.push_raw_stream_data,args = (self.Streams[-1],))
         self.raw_stream_thread.daemon = True
@@ -1620,7 +1634,7 @@ default to None, only with a valid argument that setting will be sent to the dev
         self.logger.debug(funcname)
 
         if(self.device_info != None):
-            deque = collections.deque(maxlen=self.dequelen)
+            deque = pymqdatastream.stream_deque(maxlen=self.dequelen, policy=self.deque_policy)
             # Add a overflow check flag to the deque
             # This will be used by the raw_data read functions (at the moment read_file_data only)
             self.deques_raw_serial.append(deque)
@@ -50,12 +50,7 @@ import binascii
 import yaml
 import datetime
 import importlib
-from pkg_resources import Requirement, resource_filename
-filename_version = resource_filename(Requirement.parse('pymqdatastream'),'pymqdatastream/VERSION')
-
-
-with open(filename_version) as version_file:
-    version = version_file.read().strip()
+from pymqdatastream import __version__ as version
 
 
 
@@ -0,0 +1,149 @@
+"""
+.. module:: compression
+   :platform: Unix, Windows
+   :synopsis: Registry of the compression codecs of Streams
+
+This module holds the codecs used by :class:`pymqdatastream.zmq_socket`
+to compress the serialised data of a pubstream and to decompress it in a
+substream. A pubstream declares its codec with the compression entry in
+its info dict (see :func:`pymqdatastream.Stream.get_info_dict`), a
+subscribing Stream picks the matching codec in
+:func:`pymqdatastream.Stream.connect_stream`. Whether a single packet is
+compressed is marked in the flags of its packet header, small packets
+(below the compression threshold of the stream) and packets which do
+not get smaller are sent uncompressed.
+
+The stdlib codecs zlib, bz2 and lzma are always available, lz4 and zstd
+if the lz4 or zstandard packages are installed. New codecs can be added
+with :func:`register_codec`.
+
+"""
+
+import zlib
+import logging
+import importlib.util
+
+logger = logging.getLogger('compression')
+
+
+class Codec(object):
+    """ A compression codec for the data of a Stream
+
+    Args:
+       name (str): The name of the codec, this is the compression advertised in the stream info dict
+       compress: Function compressing a frame (bytes or buffer object) into bytes
+       decompress: Function decompressing bytes (or a buffer object)
+    """
+    def __init__(self, name, compress, decompress):
+        self.name = name
+        self.compress = compress
+        self.decompress = decompress
+
+    def __str__(self):
+        return self.__class__.__name__ + ';name:' + self.name
+
+
+class decompressed_frame(bytes):
+    """ A decompressed frame for serialisers receiving zmq.Frame objects
+    (copy == False), it has the .bytes and .buffer attributes of a zmq.Frame
+    """
+    @property
+    def bytes(self):
+        return bytes(self)
+
+    @property
+    def buffer(self):
+        return memoryview(self)
+
+
+def compress_zlib(frame):
+    return zlib.compress(frame, 6)
+
+
+def compress_bz2(frame):
+    import bz2 # The codecs besides zlib are imported when needed
+    return bz2.compress(frame, 9)
+
+
+def decompress_bz2(frame):
+    import bz2
+    return bz2.decompress(frame)
+
+
+def compress_lzma(frame):
+    import lzma
+    return lzma.compress(frame)
+
+
+def decompress_lzma(frame):
+    import lzma
+    return lzma.decompress(frame)
+
+
+def compress_lz4(frame):
+    import lz4.frame
+    return lz4.frame.compress(frame)
+
+
+def decompress_lz4(frame):
+    import lz4.frame
+    return lz4.frame.decompress(frame)
+
+
+def compress_zstd(frame):
+    import zstandard
+    return zstandard.ZstdCompressor(level = 3).compress(frame)
+
+
+def decompress_zstd(frame):
+    import zstandard
+    return zstandard.ZstdDecompressor().decompress(frame)
+
+
+codecs = {} # The registry, name:Codec
+default_compression_threshold = 256 # Packets with less bytes are not compressed
+
+
+def register_codec(codec, aliases = []):
+    """ Adds a codec to the registry
+
+    Args:
+       codec: Codec object
+       aliases: List of additional names the codec is used for
+    """
+    codecs[codec.name] = codec
+    for alias in aliases:
+        codecs[alias] = codec
+
+
+def get_codec(compression):
+    """ Returns the codec for compression
+
+    Args:
+       compression (str): The name of the codec, None or 'none' for no compression
+    Returns:
+       Codec object or None if compression is None or the codec is not available
+    """
+    if((compression == None) or (compression == 'none')):
+        return None
+    try:
+        return codecs[compression]
+    except KeyError:
+        logger.warning('get_codec(): compression ' + str(compression) + ' is not available (available: ' + str(get_codecs()) + ')')
+        return None
+
+
+def get_codecs():
+    """ Returns a list of the names of all registered codecs
+    """
+    return sorted(set([c.name for c in codecs.values()]))
+
+
+register_codec(Codec('zlib', compress_zlib, zlib.decompress))
+register_codec(Codec('bz2', compress_bz2, decompress_bz2))
+register_codec(Codec('lzma', compress_lzma, decompress_lzma))
+# find_spec does not import the packages, the import is done at the first use
+if(importlib.util.find_spec('lz4') is not None):
+    register_codec(Codec('lz4', compress_lz4, decompress_lz4))
+if(importlib.util.find_spec('zstandard') is not None):
+    register_codec(Codec('zstd', compress_zstd, decompress_zstd))
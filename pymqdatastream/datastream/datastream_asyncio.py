@@ -0,0 +1,497 @@
+"""
+.. module:: datastream_asyncio
+   :platform: Unix, Windows
+   :synopsis: asyncio version of the datastream module
+
+This module provides :class:`AsyncDataStream` and :class:`AsyncStream`,
+versions of :class:`pymqdatastream.DataStream` and
+:class:`pymqdatastream.Stream` based on zmq.asyncio. Instead of
+threads polling the sockets, the sockets are served by coroutines of
+the running event loop. The wire format is the one of the datastream
+module, packets are encoded and decoded by the functions of
+:class:`pymqdatastream.zmq_socket`, therefore DataStream and
+AsyncDataStream objects can be mixed in one network.
+
+Example::
+
+    async def main():
+        async with AsyncDataStream(name = 'async') as ds:
+            stream = await ds.subscribe_stream('1@tcp://127.0.0.1:18055')
+            async for packet in stream:
+                print(packet['data'])
+
+"""
+
+import asyncio
+import time
+import threading
+import ubjson
+import zmq
+import zmq.asyncio
+import logging
+import uuid as uuid_module
+
+from pymqdatastream.datastream import datastream
+from pymqdatastream.datastream.datastream import zmq_socket, Stream, DataStream, serialised_reply, treat_address, get_ip_from_address, get_transport, create_datastream_from_info_dict, __datastream_version__
+from pymqdatastream.datastream.serialiser import get_serialiser
+from pymqdatastream.datastream.compression import get_codec
+
+logger = logging.getLogger('datastream_asyncio')
+
+# An asyncio context sharing the zmq context of the datastream
+# module, inproc addresses are therefore reachable from both
+Context = zmq.asyncio.Context.shadow(datastream.Context.underlying)
+
+
+class async_zmq_socket(zmq_socket):
+    """
+    A zmq_socket with a zmq.asyncio socket. Serialisation and
+    deserialisation are the ones of :class:`pymqdatastream.zmq_socket`,
+    sending and receiving are coroutines.
+
+    Args:
+       socket_type (str): 'control', 'pubstream', 'substream', 'repstream', 'reqstream' or 'remote_control'
+       address: zmq address string or list of addresses, for bound sockets the first free address is used
+       filter_uuid (str): message filter of a substream
+       statistic (bool): Collect statistics
+       data_format (str): The data format of the stream
+       header (str): pubstream only, the packet header format 'struct' or 'ubjson'. The subscriptions are not read, all packets are sent with this header, 'ubjson' is understood by all subscribers [default='ubjson']
+       logging_level (str or logging.DEBUG etc.):
+    """
+    def __init__(self, socket_type, address = '', filter_uuid = '', statistic = False, data_format = 'ubjson', header = 'ubjson', logging_level = 'INFO'):
+        funcname = '__init__()'
+        super(async_zmq_socket, self).__init__(socket_type, address = address, filter_uuid = filter_uuid, connect = False, statistic = statistic, data_format = data_format, header = header, logging_level = logging_level, xpub = False)
+        self.context = Context
+        if(socket_type in ('control', 'repstream', 'pubstream')):
+            ret = self.bind_socket(self.zmq_socket_type, address)
+            if(ret == False):
+                raise Exception("zmq_socket_init_failed")
+            if((socket_type == 'pubstream') and (get_transport(self.address) == 'tcp')):
+                self.bind_local_addresses()
+        elif(socket_type == 'substream'):
+            self.connect_socket(filter_uuid = self.filter_uuid)
+        else:
+            self.connect_socket(filter_uuid = '')
+
+
+    async def pub_data(self, data, data_format = 'ubjson'):
+        """ Sends data via the zmq.PUB socket, see :func:`pymqdatastream.zmq_socket.pub_data`
+
+        Args:
+            data: List of data [uuid, data to send ]
+            data_format: The data_format of the stream [default='ubjson']
+        """
+        tisend = time.time()
+        self.packets += 1
+        topics = self.get_topics(data[0])
+        n = self.packets_stream.get(topics[0], 0) + 1
+        self.packets_stream[topics[0]] = n
+        frames = get_serialiser(data_format).dumps(data[1])
+        data_serial = self.encode_header(topics, [[n, tisend, len(frames), 0]], self.header) + frames
+        self.get_telemetry(data[0]).update(tisend, sum([memoryview(f).nbytes for f in data_serial]))
+        await self.zmq_socket.send_multipart(data_serial, copy=False)
+
+
+    async def recv_packets(self):
+        """ Waits for the next message of the substream socket
+
+        Returns:
+           recv_dicts: A list of the received packets, see :func:`pymqdatastream.zmq_socket.decode_packets`
+        """
+        recv = await self.zmq_socket.recv_multipart(copy=self.serialiser.copy)
+        tirecv = time.time()
+        nbytes = sum([len(r) for r in recv])
+        if(self.do_statistic):
+            self.statistic['bytes_received'] += nbytes
+            self.statistic['packets_received'] += 1
+
+        [header, gap_markers] = self.account_packets(recv, tirecv, nbytes)
+        return gap_markers + self.decode_packets(recv, tirecv, count_lost = False, header = header)
+
+
+    async def reqrep(self, request, dt_wait = 0.1):
+        """ Sends a request and waits dt_wait seconds for the reply
+
+        Returns:
+           [tpong,reply]: as :func:`pymqdatastream.zmq_socket._get_rep_`, [None,None] if no reply arrived
+        """
+        await self.zmq_socket.send(ubjson.dumpb(request))
+        if(await self.zmq_socket.poll(dt_wait*1000, zmq.POLLIN)):
+            tpong = time.time()
+            reply = ubjson.loadb(await self.zmq_socket.recv())
+            return [tpong,reply]
+        else:
+            return [None,None]
+
+
+    async def serve(self):
+        """ Answers requests with self.socket_reply_function until cancelled,
+        the reply function can be a function or a coroutine function
+        """
+        funcname = 'serve()'
+        while True:
+            request = ubjson.loadb(await self.zmq_socket.recv())
+            if(self.do_statistic):
+                self.statistic['packets_received'] += 1
+            try:
+                reply = self.socket_reply_function(request)
+                if(asyncio.iscoroutine(reply)):
+                    reply = await reply
+            except Exception as e:
+                self.logger.warning(funcname + ': Exception: ' + str(e))
+                reply = None
+
+            if(isinstance(reply, serialised_reply)):
+                await self.zmq_socket.send(reply)
+            else:
+                await self.zmq_socket.send(ubjson.dumpb(reply))
+            if(self.do_statistic):
+                self.statistic['packets_sent'] += 1
+
+
+    def close(self):
+        """
+        Closes the socket
+        """
+        if(self.zmq_socket is not None):
+            self.zmq_socket.close(linger = 0)
+            self.zmq_socket = None
+        self.connected = False
+
+
+
+class AsyncStream(Stream):
+    """ An asyncio Stream, see :class:`pymqdatastream.Stream` for the arguments.
+
+    A subscribed AsyncStream is an asynchronous iterator::
+
+        async for packet in stream:
+            print(packet['info']['n'], packet['data'])
+
+    """
+    def __aiter__(self):
+        return self
+
+
+    async def __anext__(self):
+        return await self.recv_data()
+
+
+    async def recv_data(self):
+        """ Returns the next received packet, packets already in the deque are returned first
+
+        Returns:
+            packet: dictionary of the form {'uuid':uuid,'info':{'n':n,'ts':tsend,'tr':tirecv},'data':data}
+        """
+        funcname = 'recv_data()'
+        if(self.stream_type != 'substream'):
+            raise Exception(funcname + ": wrong stream type, cannot receive data")
+
+        while(len(self.deque) == 0):
+            for packet in await self.socket.recv_packets():
+                self.deque.appendleft(packet)
+
+        return self.deque.pop()
+
+
+    async def pub_data(self, data):
+        """ Encodes and publishes the data together with the uuid of the stream
+
+        Args:
+            data: Data
+        """
+        funcname = 'pub_data()'
+        if(self.stream_type == 'pubstream'):
+            if(self.do_statistic):
+                self.statistic['packets_sent'] += 1
+            data = [self.uuid, data]
+            for socket in self.socket:
+                await socket.pub_data(data, data_format = self.data_format)
+
+            return True
+        else:
+            raise Exception(funcname + ": wrong stream type")
+
+
+    async def reqrep(self, request, dt_wait = 0.05):
+        """ Sends a request to the connected repstream and waits for the reply
+
+        Returns:
+           [time, reply]: reply and the time it was received, [None, None] if no reply was received within dt_wait
+        """
+        funcname = 'reqrep()'
+        if(self.stream_type == 'reqstream'):
+            return await self.socket.reqrep(request, dt_wait)
+        else:
+            raise Exception(funcname + ": wrong stream type, cannot request data")
+
+
+    def connect_stream(self, stream, ind_socket = 0, statistic = False):
+        """ Connects the stream to a remote pubstream or repstream, see :func:`pymqdatastream.Stream.connect_stream`
+        """
+        funcname = '.connect_stream()'
+        if((stream.stream_type == 'pubstream') and (self.stream_type == 'substream')):
+            if(len(stream.socket) <= ind_socket):
+                raise Exception(funcname + "no socket available for subscription")
+            address = stream.socket[ind_socket].get_local_address()
+            topic = stream.socket[ind_socket].get_subscription_topic(stream.uuid)
+        elif((stream.stream_type == 'repstream') and (self.stream_type == 'reqstream')):
+            address = stream.socket.address
+            topic = stream.uuid
+        else:
+            self.logger.warning(funcname + ': cannot connect, type connect stream:' + str(stream.stream_type) + ', type self:' + str(self.stream_type))
+            return
+
+        self.uuid        = stream.uuid
+        self.variables   = stream.variables
+        self.name        = stream.name
+        self.family      = stream.family
+        self.data_format = stream.data_format
+        self.compression = stream.compression
+        self.socket      = async_zmq_socket(self.stream_type, address = address, filter_uuid = topic, statistic = statistic, data_format = self.data_format, logging_level = self.logging_level_socket)
+        self.socket.codec = get_codec(self.compression)
+
+
+    def disconnect(self):
+        """ Disconnects the stream
+        """
+        if(self.stream_type in ('substream', 'reqstream')):
+            self.socket.close()
+
+
+
+class AsyncDataStream(object):
+    """The asyncio DataStream object. The control socket is served by
+    a task of the event loop, which is started by :func:`AsyncDataStream.start`
+    or by using the object as an asynchronous context manager.
+
+    Args:
+       address: The address the control socket is bound to, default = None: Searches for the next free port on the predefined ports
+       name: The name of the datastream [default='datastream']
+       logging_level: The logging level of the logger object
+       logging_level_socket: The logging level of the sockets
+
+    """
+    # The functions are shared with DataStream, so that requests are answered identically
+    control_socket_reply   = DataStream.control_socket_reply
+    get_info               = DataStream.get_info
+    get_info_serialised    = DataStream.get_info_serialised
+    get_stats              = DataStream.get_stats
+    get_stream_from_uuid   = DataStream.get_stream_from_uuid
+    get_stream_from_number = DataStream.get_stream_from_number
+    get_streams_from_name  = DataStream.get_streams_from_name
+    get_streams_from_family = DataStream.get_streams_from_family
+    index_stream           = DataStream.index_stream
+    unindex_stream         = DataStream.unindex_stream
+    has_stream             = DataStream.has_stream
+    get_name_str           = DataStream.get_name_str
+    get_info_str           = DataStream.get_info_str
+    get_stream_address     = DataStream.get_stream_address
+    __str__                = DataStream.__str__
+
+    def __init__(self, address = None, name = 'datastream', logging_level = 'INFO', logging_level_socket = 'INFO'):
+        funcname = '.__init__()'
+        self.logger = logging.getLogger(self.__class__.__name__ + '(' + name + ')')
+        self.logging_level = logging_level
+        self.logging_level_socket = logging_level_socket
+        if((logging_level == 'DEBUG') | (logging_level == logging.DEBUG)):
+            self.logger.setLevel(logging.DEBUG)
+        elif((logging_level == 'INFO') | (logging_level == logging.INFO)):
+            self.logger.setLevel(logging.INFO)
+        else:
+            self.logger.setLevel(logging.CRITICAL)
+
+        self.logger.debug(funcname)
+        self.sockets = []
+        self.Streams = []
+        self.streams_index = {'uuid':{}, 'number':{}, 'name':{}, 'family':{}}
+        self.num_streams = 0
+        self.remote = False
+        self.name = name
+        self.created = time.time()
+        self.info_version = 0
+        self.info_serialised = None
+        self.info_lock = threading.Lock()
+        self.tasks = []
+        self.uuid = 'pymqds_' + __datastream_version__ + '_DataStream' + ':' + str(uuid_module.uuid1())
+        control_socket = async_zmq_socket('control', address = treat_address(address), logging_level = self.logging_level_socket)
+        control_socket.socket_reply_function = self.control_socket_reply
+        self.address = control_socket.address
+        self.ip = get_ip_from_address(self.address)
+        self.sockets.append(control_socket)
+        self.control_stream = Stream(name = 'Control Stream',stream_type = 'control', socket = control_socket, logging_level = self.logging_level,logging_level_socket = self.logging_level_socket,number=self.num_streams)
+        self.num_streams += 1
+        self.Streams.append(self.control_stream)
+        self.index_stream(self.control_stream)
+
+
+    def streams_changed(self):
+        """ Increases the info_version and invalidates the cached info reply, see :func:`pymqdatastream.DataStream.streams_changed`
+        """
+        with self.info_lock:
+            self.info_version += 1
+            self.info_serialised = None
+
+
+    async def start(self):
+        """ Starts the task answering the requests of the control socket
+        """
+        if(len(self.tasks) == 0):
+            self.tasks.append(asyncio.ensure_future(self.sockets[0].serve()))
+
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+
+    def add_pub_socket(self, address = None):
+        """ Adds a zmq.PUB socket
+
+        Args:
+            address: An address string or a list of addresses, default None uses the standard publish ports
+        Returns:
+            socket
+        """
+        if(address == None):
+            address = treat_address(self.ip,control=False)
+
+        pub_socket = async_zmq_socket('pubstream', address = address, logging_level = self.logging_level_socket)
+        self.sockets.append(pub_socket)
+        return pub_socket
+
+
+    def add_pub_stream(self, socket, variables = None, name = None, family = 'NA', statistic = False, data_format = 'ubjson'):
+        """ Adds a new pubstream, see :func:`pymqdatastream.DataStream.add_pub_stream`
+
+        Returns:
+            stream: The AsyncStream
+        """
+        if(socket.socket_type == 'pubstream'):
+            stream = AsyncStream(stream_type = 'pubstream',socket = socket, variables = variables, name = name, family = family, statistic = statistic, data_format = data_format, logging_level = self.logging_level,logging_level_socket = self.logging_level_socket, number = self.num_streams)
+            self.num_streams += 1
+            self.Streams.append(stream)
+            self.index_stream(stream)
+            self.streams_changed()
+            return stream
+        else:
+            raise Exception("wrong socket_type:",socket.socket_type, " it should be: pubstream")
+
+
+    async def get_datastream_info(self, address, dt_wait = 0.1):
+        """ Pings the datastream at address and requests its info
+
+        Returns:
+            [True,info_dict] or [False,None] if no datastream was found
+        """
+        socket = async_zmq_socket('remote_control', address = address, logging_level = self.logging_level_socket)
+        try:
+            tping = time.time()
+            reply = await socket.reqrep({'ping':'','uuid':self.uuid,'tping':tping}, dt_wait)
+            if(reply[0] == None):
+                return [False,None]
+
+            reply = await socket.reqrep({'get':'info'}, dt_wait)
+            if(reply[0] == None):
+                return [False,None]
+
+            return [True,reply[1]]
+        finally:
+            socket.close()
+
+
+    async def query_datastreams(self, addresses = None, dt_wait = 0.1):
+        """ Queries all addresses concurrently
+
+        Args:
+            addresses: List of addresses to query, if not defined standard addresses will be used
+        Returns:
+            datastreams: A list of remote datastreams found
+        """
+        addresses = [a for a in treat_address(addresses) if a != self.address]
+        replies = await asyncio.gather(*[self.get_datastream_info(a, dt_wait) for a in addresses])
+        datastreams_remote = []
+        for [ret,reply_dict] in replies:
+            if(ret):
+                datastreams_remote.append(create_datastream_from_info_dict(reply_dict))
+
+        return datastreams_remote
+
+
+    async def subscribe_stream(self, substream = None, statistic = False):
+        """ Subscribes a stream of a remote datastream, see :func:`pymqdatastream.DataStream.subscribe_stream`
+
+        Args:
+            substream: either a Stream object or a valid stream address string like 2@tcp://127.0.0.1:18055
+            statistic: do statistics of stream
+        Returns:
+            stream: The subscribed AsyncStream or None if subscription failed
+        """
+        funcname = 'subscribe_stream()'
+        if(isinstance(substream,str)):
+            address = substream.rsplit('@')
+            stream_address = address[0]
+            [found_datastream,info_dict] = await self.get_datastream_info(address[1])
+            if(found_datastream == False):
+                self.logger.critical('Did not find a datastream at: ' + address[1])
+                return None
+
+            DSremote = create_datastream_from_info_dict(info_dict,logging_level = self.logging_level)
+            if('::' in stream_address):
+                substream = DSremote.get_stream_from_uuid(stream_address)
+            else:
+                substream = DSremote.get_stream_from_number(int(stream_address))
+
+        if(not isinstance(substream,Stream)):
+            self.logger.warning(funcname + ': Stream is not of type datastream.stream neither a str address')
+            return None
+
+        if(substream.stream_type == 'pubstream'):
+            stream = AsyncStream('substream', statistic = statistic, number = self.num_streams, logging_level = self.logging_level, logging_level_socket = self.logging_level_socket)
+        elif(substream.stream_type == 'repstream'):
+            stream = AsyncStream('reqstream', statistic = statistic, number = self.num_streams, logging_level = self.logging_level, logging_level_socket = self.logging_level_socket)
+        else:
+            raise Exception('Unknown stream type:' + str(substream.stream_type) + ', dont know how to subscribe ...')
+
+        stream.connect_stream(substream, statistic = statistic)
+        if((stream.socket == None) or (stream.socket.connected == False)):
+            return None
+
+        self.num_streams += 1
+        self.Streams.append(stream)
+        self.index_stream(stream)
+        self.sockets.append(stream.socket)
+        self.streams_changed()
+        return stream
+
+
+    def rem_stream(self, disstream):
+        """ Disconnects and removes a Stream
+
+        Returns:
+            bool: True if the stream was removed
+        """
+        if(self.has_stream(disstream)):
+            disstream.disconnect()
+            self.Streams.remove(disstream)
+            self.unindex_stream(disstream)
+            self.streams_changed()
+            return True
+
+        return False
+
+
+    async def close(self):
+        """ Cancels the tasks and closes all sockets
+        """
+        for task in self.tasks:
+            task.cancel()
+
+        await asyncio.gather(*self.tasks, return_exceptions = True)
+        self.tasks = []
+        for sock in self.sockets:
+            sock.close()
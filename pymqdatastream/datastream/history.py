@@ -0,0 +1,180 @@
+"""
+.. module:: history
+   :platform: Unix, Windows
+   :synopsis: Ring buffer of the last packets of a pubstream
+
+A pubstream with a history (see
+:func:`pymqdatastream.DataStream.add_pub_stream`) keeps its last
+packets, limited by their number, their age and the bytes they use, in
+a :class:`stream_history`. A subscriber joining later requests them
+with {'get':'history','uuid':uuid,'since':n} at the control socket of
+the publishing datastream and gets them before the live packets, the
+packet numbers tell which packets it got already live (see
+:func:`pymqdatastream.DataStream.subscribe_stream` and
+:func:`pymqdatastream.Stream.backfill`).
+
+The packets are stored serialised, the frames of all packets in one
+preallocated bytearray used as a ring, the packet number, the send
+time and the position of every packet in arrays of fixed size. The
+memory of a history does not grow with the number or the size of the
+packets, the oldest packets are overwritten instead.
+
+"""
+
+import time
+import array
+import struct
+import threading
+
+default_history_bytes = 4194304 # The size of the ring of the serialised packets
+frame_length_struct = struct.Struct('<I') # Every frame is stored with its length
+
+
+class stream_history(object):
+    """ The last packets of a pubstream, numbered and serialised by
+    :func:`pymqdatastream.zmq_socket.pub_data`
+
+    Args:
+       maxpackets (int): Maximum number of packets [default=1000]
+       maxtime (float): Maximum age of the packets in seconds, None for no limit [default=None]
+       maxbytes (int): Size of the ring of the serialised packets in bytes, larger packets are not stored [default=4194304]
+    """
+    def __init__(self, maxpackets = 1000, maxtime = None, maxbytes = default_history_bytes):
+        funcname = 'stream_history.__init__()'
+        if(maxpackets < 1):
+            raise Exception(funcname + ': maxpackets has to be >= 1')
+
+        self.maxpackets = maxpackets
+        self.maxtime = maxtime
+        self.maxbytes = maxbytes
+        self.buffer = bytearray(maxbytes)
+        # One slot per packet, the slots are used as a ring as well
+        self.n = array.array('q', [0]) * maxpackets
+        self.ts = array.array('d', [0.0]) * maxpackets
+        self.offset = array.array('q', [0]) * maxpackets
+        self.nbytes = array.array('q', [0]) * maxpackets
+        self.first = 0 # The slot of the oldest packet
+        self.num = 0 # The number of packets
+        self.pos = 0 # The position in self.buffer the next packet is written to
+        self.packets_too_big = 0 # Packets bigger than maxbytes, they are not stored
+        self.lock = threading.Lock()
+
+
+    def add(self, n, ts, frames):
+        """ Stores a packet, the oldest packets are dropped if needed
+
+        Args:
+           n: The packet number
+           ts: The send time
+           frames: The frames created by the serialiser (bytes or buffer objects)
+        Returns:
+           bool: False if the packet is bigger than maxbytes and was not stored
+        """
+        views = [memoryview(f).cast('B') for f in frames]
+        nbytes = sum([frame_length_struct.size + len(v) for v in views])
+        if(nbytes > self.maxbytes):
+            self.packets_too_big += 1
+            return False
+
+        with self.lock:
+            pos = self.pos
+            if((pos + nbytes) > self.maxbytes): # Start at the beginning again, the packets at the end are the oldest
+                while((self.num > 0) and (self.offset[self.first] >= pos)):
+                    self._drop_oldest()
+                pos = 0
+
+            # Drop the packets in the way and make a free slot
+            while((self.num > 0) and (self.offset[self.first] >= pos) and (self.offset[self.first] < (pos + nbytes))):
+                self._drop_oldest()
+            if(self.num == self.maxpackets):
+                self._drop_oldest()
+
+            slot = (self.first + self.num) % self.maxpackets
+            self.n[slot] = n
+            self.ts[slot] = ts
+            self.offset[slot] = pos
+            self.nbytes[slot] = nbytes
+            self.num += 1
+            for v in views:
+                frame_length_struct.pack_into(self.buffer, pos, len(v))
+                pos += frame_length_struct.size
+                self.buffer[pos:pos + len(v)] = v
+                pos += len(v)
+
+            self.pos = pos
+            self._drop_old(ts)
+
+        return True
+
+
+    def _drop_oldest(self):
+        """ Drops the oldest packet, has to be called with the lock acquired
+        """
+        self.first = (self.first + 1) % self.maxpackets
+        self.num -= 1
+        if(self.num == 0):
+            self.pos = 0
+
+
+    def _drop_old(self, tnow):
+        """ Drops the packets older than maxtime, has to be called with the lock acquired
+        """
+        if(self.maxtime == None):
+            return
+
+        while((self.num > 0) and ((tnow - self.ts[self.first]) > self.maxtime)):
+            self._drop_oldest()
+
+
+    def get(self, since = 0):
+        """ Returns the stored packets with a packet number of at least since
+
+        Args:
+           since: The packet number of the first packet wanted [default=0]
+        Returns:
+           packets: list of [n, ts, frames], oldest first, frames is a list of bytes
+        """
+        packets = []
+        with self.lock:
+            self._drop_old(time.time())
+            for i in range(self.num):
+                slot = (self.first + i) % self.maxpackets
+                n = self.n[slot]
+                if(n < since):
+                    continue
+
+                frames = []
+                pos = self.offset[slot]
+                end = pos + self.nbytes[slot]
+                while(pos < end):
+                    (length,) = frame_length_struct.unpack_from(self.buffer, pos)
+                    pos += frame_length_struct.size
+                    frames.append(bytes(self.buffer[pos:pos + length]))
+                    pos += length
+
+                packets.append([n, self.ts[slot], frames])
+
+        return packets
+
+
+    def get_info(self):
+        """ Returns a dictionary of the limits of the history, advertised in the info dict of the stream
+        """
+        info_dict = {}
+        info_dict['packets'] = self.maxpackets
+        info_dict['time'] = self.maxtime
+        info_dict['bytes'] = self.maxbytes
+        return info_dict
+
+
+    def get_statistic(self):
+        """ Returns a dictionary with the number of stored packets, their range of packet numbers and the bytes used
+        """
+        with self.lock:
+            statistic = {}
+            statistic['packets'] = self.num
+            statistic['n_first'] = self.n[self.first] if (self.num > 0) else None
+            statistic['n_last'] = self.n[(self.first + self.num - 1) % self.maxpackets] if (self.num > 0) else None
+            statistic['bytes'] = sum([self.nbytes[(self.first + i) % self.maxpackets] for i in range(self.num)])
+            statistic['too_big'] = self.packets_too_big
+            return statistic
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+.. module:: registry
+   :platform: Unix, Windows
+   :synopsis: A lightweight registry service for the discovery of datastreams
+
+Without a registry datastreams are found by probing all standard
+control ports of a host (see :func:`pymqdatastream.treat_address`). A
+:class:`DataStreamRegistry` keeps the info dicts of all datastreams
+registered at it, a query is then a single request. A
+:class:`pymqdatastream.DataStream` created with registry=True (or the
+address of a registry) registers its info dict on startup, sends it as a
+heartbeat every heartbeat_interval seconds and deregisters on close.
+Datastreams not sending a heartbeat within timeout seconds are removed.
+
+The registry is a zmq.REP socket, requests and replies are ubjson
+encoded dicts:
+
+- {'register':info_dict} or {'heartbeat':info_dict} -> {'registered':uuid}
+- {'deregister':uuid} -> {'deregistered':uuid}
+- {'get':'datastreams'} -> {'datastreams':[info_dict, ...]}
+- {'get':'datastream','address':address} -> {'datastream':info_dict or None}
+- {'ping':''} -> {'pong':'','tpong':time}
+
+Start the registry with::
+
+    pymqds_registry -v
+
+"""
+
+import sys
+import time
+import logging
+import threading
+import argparse
+import zmq
+import ubjson
+
+logger = logging.getLogger('registry')
+logger.setLevel(logging.INFO)
+
+standard_datastream_registry_port    = 18054 # The port of the registry, just below the control ports
+standard_datastream_registry_address = 'tcp://127.0.0.1:' + str(standard_datastream_registry_port)
+
+
+def registry_request(request, address = standard_datastream_registry_address, dt_wait = 0.2, context = None):
+    """Sends a request to a registry and waits dt_wait seconds for the
+    reply. A new REQ socket is used for every request, a registry not
+    replying does therefore not block later requests.
+
+    Args:
+       request: dict with the request
+       address: The address of the registry [default=standard_datastream_registry_address]
+       dt_wait: Time in seconds to wait for a reply
+       context: zmq context, if None the global zmq context is used
+    Returns:
+       reply: dict with the reply or None if the registry did not reply
+    """
+    funcname = 'registry_request()'
+    if(context == None):
+        context = zmq.Context.instance()
+
+    socket = context.socket(zmq.REQ)
+    socket.setsockopt(zmq.LINGER, 0)
+    try:
+        socket.connect(address)
+        socket.send(ubjson.dumpb(request))
+        if(socket.poll(dt_wait * 1000) == 0):
+            logger.debug(funcname + ': No reply from registry at ' + address)
+            return None
+
+        return ubjson.loadb(socket.recv())
+    except Exception as e:
+        logger.debug(funcname + ': ' + str(e))
+        return None
+    finally:
+        socket.close()
+
+
+class DataStreamRegistry(object):
+    """The registry service, it binds a zmq.REP socket to address and
+    serves the requests in its own thread.
+
+    Args:
+       address: The address of the registry [default=standard_datastream_registry_address]
+       timeout: Time in seconds after which a datastream without heartbeat is removed [default=10]
+       logging_level:
+
+    """
+    def __init__(self, address = standard_datastream_registry_address, timeout = 10.0, logging_level = 'INFO'):
+        funcname = '__init__()'
+        self.logger = logging.getLogger(self.__class__.__name__)
+        if((logging_level == 'DEBUG') | (logging_level == logging.DEBUG)):
+            self.logger.setLevel(logging.DEBUG)
+        elif((logging_level == 'INFO') | (logging_level == logging.INFO)):
+            self.logger.setLevel(logging.INFO)
+        else:
+            self.logger.setLevel(logging.CRITICAL)
+
+        self.address = address
+        self.timeout = timeout
+        self.datastreams = {} # uuid:[info_dict, time of last heartbeat]
+        self.context = zmq.Context.instance()
+        self.socket = self.context.socket(zmq.REP)
+        self.socket.setsockopt(zmq.LINGER, 0)
+        self.socket.bind(address)
+        self.logger.info(funcname + ': Registry at ' + address)
+        self.thread_stop = threading.Event()
+        self.thread = threading.Thread(target = self.serve_thread)
+        self.thread.daemon = True
+        self.thread.start()
+
+
+    def remove_expired(self):
+        """ Removes all datastreams without a heartbeat within self.timeout
+        """
+        funcname = 'remove_expired()'
+        tnow = time.time()
+        for uuid in list(self.datastreams.keys()):
+            if((tnow - self.datastreams[uuid][1]) > self.timeout):
+                self.logger.info(funcname + ': Removing ' + uuid + ', no heartbeat')
+                self.datastreams.pop(uuid)
+
+
+    def get_datastream_from_address(self, address):
+        """
+        Returns:
+           info_dict: The info dict of the datastream with the control address address or None
+        """
+        for [info_dict, theartbeat] in self.datastreams.values():
+            if(info_dict['address'] == address):
+                return info_dict
+
+        return None
+
+
+    def process_request(self, request):
+        """ Processes a request and returns the reply
+        """
+        funcname = 'process_request()'
+        self.remove_expired()
+        if('register' in request) or ('heartbeat' in request):
+            try:
+                info_dict = request['register']
+            except KeyError:
+                info_dict = request['heartbeat']
+
+            if(info_dict['uuid'] not in self.datastreams):
+                self.logger.info(funcname + ': Registered ' + info_dict['name'] + ' at ' + info_dict['address'])
+
+            self.datastreams[info_dict['uuid']] = [info_dict, time.time()]
+            return {'registered':info_dict['uuid']}
+
+        elif('deregister' in request):
+            uuid = request['deregister']
+            if(self.datastreams.pop(uuid, None) != None):
+                self.logger.info(funcname + ': Deregistered ' + uuid)
+
+            return {'deregistered':uuid}
+
+        elif('get' in request):
+            if(request['get'] == 'datastreams'):
+                return {'datastreams':[d[0] for d in self.datastreams.values()]}
+            elif(request['get'] == 'datastream'):
+                return {'datastream':self.get_datastream_from_address(request['address'])}
+
+        elif('ping' in request):
+            return {'pong':'','tpong':time.time()}
+
+        self.logger.debug(funcname + ': unknown request: ' + str(request))
+        return {'error':'unknown request'}
+
+
+    def serve_thread(self, dt_wait = 0.05):
+        funcname = 'serve_thread()'
+        while(self.thread_stop.is_set() == False):
+            if(self.socket.poll(dt_wait * 1000) == 0):
+                continue
+
+            try:
+                request = ubjson.loadb(self.socket.recv())
+                reply = self.process_request(request)
+            except Exception as e:
+                self.logger.warning(funcname + ': Could not process request: ' + str(e))
+                reply = {'error':str(e)}
+
+            self.socket.send(ubjson.dumpb(reply))
+
+        self.socket.close()
+
+
+    def close(self):
+        self.thread_stop.set()
+        self.thread.join()
+
+
+def main():
+    address_help = 'The address of the registry [default=' + standard_datastream_registry_address + ']'
+    timeout_help = 'Time in seconds after which a datastream without heartbeat is removed'
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--address', '-a', default = standard_datastream_registry_address, help = address_help)
+    parser.add_argument('--timeout', '-t', type = float, default = 10.0, help = timeout_help)
+    parser.add_argument('--verbose', '-v', action='count')
+    args = parser.parse_args()
+    logging.basicConfig(stream=sys.stderr, level=logging.INFO)
+    if(args.verbose == None):
+        logging_level = logging.CRITICAL
+    elif(args.verbose == 1):
+        logging_level = logging.INFO
+    else:
+        logging_level = logging.DEBUG
+
+    registry = DataStreamRegistry(address = args.address, timeout = args.timeout, logging_level = logging_level)
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+
+    registry.close()
+
+
+if __name__ == '__main__':
+    main()
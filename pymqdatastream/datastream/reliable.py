@@ -0,0 +1,565 @@
+"""
+.. module:: reliable
+   :platform: Unix, Windows
+   :synopsis: Reliable streams with credit based flow control and retransmission
+
+A zmq.PUB socket drops packets silently if the high water mark of a
+subscriber is reached or its TCP connection is reset, the subscriber
+only sees a gap in the packet numbers. For data which is useless with
+gaps, e.g. the raw byte stream of a TODL, which is cut into COBS frames
+by the subscriber, a pubstream can be published on a
+:class:`reliable_zmq_socket` instead (see
+:func:`pymqdatastream.DataStream.add_reliable_socket`). Subscribers
+connect with a zmq.DEALER socket to the zmq.ROUTER socket of the
+publisher, :func:`pymqdatastream.DataStream.subscribe_stream` does this
+automatically for streams of reliable sockets.
+
+Messages (the zmq.ROUTER socket prepends the identity of the
+subscriber, (a, b) are two packet numbers encoded with reliable_struct):
+
+   * subscriber -> publisher [b'sub', uuid, (n_acked, n_credit)]: Subscribes the stream uuid, n_acked is the last packet received before (0 for a new subscription)
+   * publisher -> subscriber [b'start', uuid, (n_next, 0)]: The number of the first packet the subscriber will get
+   * publisher -> subscriber [packet_header_topic + uuid, packet_header, data frames]: A packet, as sent by a pubstream with binary headers
+   * subscriber -> publisher [b'ack', uuid, (n_acked, n_credit)]: All packets up to n_acked were received, packets up to n_credit may be sent. The ack is also the heartbeat of the subscriber.
+   * subscriber -> publisher [b'nack', uuid, (n_from, n_credit)]: Packet n_from is missing, the publisher sends again from n_from on (go-back-n)
+   * publisher -> subscriber [b'lost', uuid, (n_first, n_last)]: The packets are not in the send buffer anymore
+   * subscriber -> publisher [b'unsub', uuid, (0, 0)]
+
+Flow control: a subscriber grants credit for at most window packets
+not yet acknowledged. If the deque of its Stream has the policy 'block'
+or 'drop_newest' the credit is limited to the free space of the deque,
+a consumer which does not keep up stops the publisher from sending to it
+instead of overflowing its deque (with 'drop_oldest' the deque drops the
+oldest packets as usual). The packets wait in the send buffer of their stream (a
+:class:`pymqdatastream.stream_deque`) until all subscribers
+acknowledged them. If the buffer is full pub_data() waits (policy
+'block', at most timeout seconds) or the oldest packets are dropped
+('drop_oldest'), subscribers still missing them get a lost message and
+count a gap. A subscriber which was not heard of for dt_timeout seconds
+is removed, until then it can reconnect (e.g. after a TCP reset) and
+continues where it stopped.
+
+"""
+
+import time
+import queue
+import struct
+import threading
+import zmq
+from pymqdatastream.datastream.datastream import zmq_socket, stream_deque, get_transport, packet_header_struct, packet_header_version
+from pymqdatastream.datastream.serialiser import get_serialiser
+from pymqdatastream.datastream.compression import default_compression_threshold
+
+reliable_struct = struct.Struct('<QQ')
+reliable_policies = ['block', 'drop_oldest']
+
+
+class reliable_zmq_socket(zmq_socket):
+    """ A zmq_socket of a reliable stream, either the zmq.ROUTER socket of
+    the publisher (socket_type 'reliable') or the zmq.DEALER socket of a
+    subscriber (socket_type 'reliablesub'). Both have their own thread,
+    the reactor is not used.
+
+    Args:
+       socket_type (str): 'reliable' or 'reliablesub'
+       address: reliable: address or list of addresses to bind to, the first free one is used; reliablesub: the address to connect to
+       deque: reliablesub only, the deque of the Stream
+       filter_uuid (str): reliablesub only, the uuid of the subscribed stream
+       window (int): reliable: the maximum credit of a subscriber in packets, advertised in the socket info; reliablesub: the credit granted, the window of the publisher [default=1000]
+       buffer_packets (int): reliable only, maximum number of unacknowledged packets in the send buffer of each stream [default=10000]
+       buffer_bytes (int): reliable only, maximum size of the send buffer of each stream in bytes, None for no limit [default=None]
+       policy (str): reliable only, 'block' or 'drop_oldest', what pub_data() does if the send buffer is full [default='block']
+       timeout (float): block only, maximum time in seconds pub_data() waits for space in the send buffer, the oldest packets are dropped then [default=1.0]
+       dt_ack (float): reliablesub only, interval in seconds of the acks while packets arrive [default=0.01]
+       dt_heartbeat (float): Interval in seconds of the acks of an idle subscriber, the publisher checks the timeouts in this interval [default=1.0]
+       dt_rto (float): Time in seconds without progress after which unacknowledged packets are sent again (publisher) or a missing packet is requested again (subscriber) [default=0.5]
+       dt_timeout (float): reliable only, a subscriber not heard of for dt_timeout seconds is removed [default=30.0]
+       bind_local (bool): reliable only, bind additionally to ipc and inproc addresses, see :class:`pymqdatastream.zmq_socket` [default=True]
+       statistic, data_format, serialiser, lazy, gap_markers, codec, rcvhwm, logging_level: see :class:`pymqdatastream.zmq_socket`
+    """
+    def __init__(self, socket_type, address = '', deque = None, filter_uuid = '', window = 1000, buffer_packets = 10000, buffer_bytes = None, policy = 'block', timeout = 1.0, dt_ack = 0.01, dt_heartbeat = 1.0, dt_rto = 0.5, dt_timeout = 30.0, bind_local = True, statistic = False, data_format = 'ubjson', serialiser = None, lazy = False, gap_markers = False, codec = None, rcvhwm = None, logging_level = 'INFO'):
+        funcname = 'reliable_zmq_socket.__init__()'
+        if(policy not in reliable_policies):
+            raise Exception(funcname + ': unknown policy: ' + str(policy) + ', known policies: ' + str(reliable_policies))
+
+        # The zmq.ROUTER queues up to window packets for every subscriber
+        sndhwm = 2 * window if (socket_type == 'reliable') else None
+        super(reliable_zmq_socket, self).__init__(socket_type, address = address, deque = deque, filter_uuid = filter_uuid, connect = False, statistic = statistic, data_format = data_format, serialiser = serialiser, lazy = lazy, gap_markers = gap_markers, codec = codec, sndhwm = sndhwm, rcvhwm = rcvhwm, bind_local = bind_local, logging_level = logging_level)
+        self.window = window
+        self.buffer_packets = buffer_packets
+        self.buffer_bytes = buffer_bytes
+        self.policy = policy
+        self.timeout = timeout
+        self.dt_ack = dt_ack
+        self.dt_heartbeat = dt_heartbeat
+        self.dt_rto = dt_rto
+        self.dt_timeout = dt_timeout
+        self.buffers = {} # reliable: The send buffer of every stream, uuid_ser:stream_deque of [n, ts, frames, flags]
+        self.receivers = {} # reliable: The state of every subscriber, identity:dict
+        self.subscribers = {} # reliable: The identities of the subscribers of every stream, uuid:set
+        self.packets_retransmitted = 0 # reliable: Packets sent again
+        self.packets_reported_lost = 0 # reliable: Packets reported lost to subscribers
+        self.n_acked = 0 # reliablesub: All packets up to n_acked were received or reported lost
+        self.n_nack = None # reliablesub: The packet number of the last nack
+        self.tnack = 0
+        self.tack = 0 # reliablesub: The time of the last ack
+        self.credit_sent = 0 # reliablesub: The credit sent with the last ack
+        self.packets_since_ack = 0
+        self.nacks = 0 # reliablesub: Number of retransmit requests
+        self.ack_every = max(1, window // 4) # reliablesub: An ack is sent at least every ack_every packets
+
+        if(socket_type == 'reliable'):
+            ret = self.bind_socket(zmq.ROUTER, address)
+            if(ret == False):
+                raise Exception(funcname + ': could not bind to ' + str(address))
+            self.zmq_socket.setsockopt(zmq.ROUTER_MANDATORY, 1) # Sending to a full or unknown subscriber raises instead of dropping
+            self.zmq_socket.setsockopt(zmq.ROUTER_HANDOVER, 1) # A reconnecting subscriber takes over its identity
+            if(bind_local and (get_transport(self.address) == 'tcp')):
+                self.bind_local_addresses()
+
+            self.start_reliable_thread()
+        elif(socket_type == 'reliablesub'):
+            self.filter_uuid_ser = filter_uuid.encode('utf-8')
+            self.zmq_socket = self.context.socket(zmq.DEALER)
+            self.zmq_socket.setsockopt(zmq.IDENTITY, self.uuid.encode('utf-8')) # Kept when reconnecting
+            self.set_hwm(self.zmq_socket)
+            self.zmq_socket.connect(address)
+            self.connected = True
+            self.start_reliable_thread()
+        else:
+            raise Exception(funcname + ': unknown socket_type: ' + str(socket_type))
+
+
+    def start_reliable_thread(self):
+        """ Starts the thread serving the socket, the publisher thread is woken up by pub_data() via an inproc socket
+        """
+        socket = self.zmq_socket
+        self.zmq_socket = None
+        self.thread_queue = queue.Queue()
+        if(self.socket_type == 'reliable'):
+            wakeup = self.create_wakeup_socket()
+            self.reliable_thread = threading.Thread(target = self.reliable_send_thread, args = (socket, wakeup))
+        else:
+            self.reliable_thread = threading.Thread(target = self.reliable_recv_thread, args = (socket,))
+
+        self.reliable_thread.daemon = True
+        self.reliable_thread.start()
+
+
+    def stop_poll_thread(self):
+        """ Stops the thread of the socket, a subscriber unsubscribes before
+        """
+        funcname = 'stop_poll_thread()'
+        if(self.thread_queue == None):
+            self.logger.debug(funcname + ': No thread queue, doing nothing')
+            return
+
+        self.thread_queue.put('stop')
+        if(self.socket_type == 'reliable'):
+            self.wakeup()
+        self.reliable_thread.join()
+        self.reliable_thread = None
+        self.thread_queue = None
+        if(self.socket_type == 'reliable'):
+            self.wakeup_socket.close(linger = 0)
+            self.wakeup_socket = None
+        self.connected = False
+
+
+    def stop_poll_substream_thread(self):
+        self.stop_poll_thread()
+
+
+    def has_subscriber(self, uuid):
+        """ Returns True if a subscriber subscribed to the stream with uuid
+        """
+        return len(self.subscribers.get(uuid, ())) > 0
+
+
+    def get_buffer(self, uuid_ser):
+        """ Returns the send buffer of the stream uuid_ser, the newest packet is on the left side
+        """
+        try:
+            return self.buffers[uuid_ser]
+        except KeyError:
+            buffer = stream_deque(maxlen = self.buffer_packets, maxbytes = self.buffer_bytes, policy = 'drop_oldest')
+            self.buffers[uuid_ser] = buffer
+            return buffer
+
+
+    def pub_data(self, data, data_format = 'ubjson', codec = None, compression_threshold = default_compression_threshold, history = None):
+        """ Serialises the data and puts it into the send buffer of the
+        stream, the publishing thread sends it to the subscribers as far
+        as their credit allows. The arguments are the ones of
+        :func:`pymqdatastream.zmq_socket.pub_data`.
+
+        Returns:
+            True if the data was put into the send buffer, False if nobody subscribed to the stream
+        """
+        if((self.has_subscriber(data[0]) == False) and (history is None)):
+            self.packets_skipped += 1
+            return False
+
+        tisend = time.time()
+        topics = self.get_topics(data[0])
+        n = self.packets_stream.get(topics[0], 0) + 1
+        self.packets_stream[topics[0]] = n
+        frames = get_serialiser(data_format).dumps(data[1])
+        if(history is not None):
+            history.add(n, tisend, frames)
+        if(self.has_subscriber(data[0]) == False): # Numbered for the history only
+            buffer = self.buffers.get(topics[0], None)
+            if(buffer != None): # The packet numbers in the send buffer have to be contiguous
+                with buffer.condition:
+                    buffer.clear()
+            self.packets_skipped += 1
+            return False
+
+        [frames, flags] = self.compress_frames(frames, codec, compression_threshold)
+        nbytes = sum([memoryview(f).nbytes for f in frames])
+        buffer = self.get_buffer(topics[0])
+        with buffer.condition:
+            if(self.policy == 'block'): # Wait for the acks of the subscribers
+                buffer.condition.wait_for(lambda: not buffer.is_full(nbytes), self.timeout)
+            buffer.put([n, tisend, frames, flags], nbytes) # Drops the oldest packets if still full
+
+        self.packets += 1
+        self.get_telemetry(data[0]).update(tisend, nbytes)
+        self.wakeup()
+        return True
+
+
+    def reliable_send_thread(self, socket, wakeup):
+        """ The thread of the publisher, it processes the messages of the
+        subscribers, sends the packets of the send buffers as far as the
+        credit of the subscribers allows and removes acknowledged packets
+        """
+        funcname = 'reliable_send_thread()'
+        poller = zmq.Poller()
+        poller.register(socket, zmq.POLLIN)
+        poller.register(wakeup, zmq.POLLIN)
+        tcheck = time.time()
+        while True:
+            events = dict(poller.poll(self.dt_heartbeat * 1000))
+            if(wakeup in events):
+                self.recv_wakeup(wakeup)
+                try:
+                    self.thread_queue.get(block = False)
+                    break
+                except queue.Empty:
+                    pass
+
+            if(socket in events):
+                while True:
+                    try:
+                        msg = socket.recv_multipart(zmq.NOBLOCK)
+                    except zmq.Again:
+                        break
+                    self.process_subscriber_message(socket, msg)
+
+            for identity in list(self.receivers.keys()):
+                self.send_packets(socket, identity)
+
+            tnow = time.time()
+            if((tnow - tcheck) > self.dt_heartbeat):
+                tcheck = tnow
+                for identity in list(self.receivers.keys()):
+                    if((tnow - self.receivers[identity]['tlast']) > self.dt_timeout):
+                        self.logger.debug(funcname + ': subscriber ' + str(identity) + ' timed out')
+                        self.remove_receiver(identity)
+
+            self.trim_buffers()
+
+        socket.close(linger = 0)
+        wakeup.close(linger = 0)
+        self.logger.debug(funcname + ': Closed')
+
+
+    def remove_receiver(self, identity):
+        receiver = self.receivers.pop(identity)
+        self.subscribers.get(receiver['uuid'], set()).discard(identity)
+
+
+    def process_subscriber_message(self, socket, msg):
+        """ Processes a sub, ack, nack or unsub message of a subscriber
+        """
+        funcname = 'process_subscriber_message()'
+        if(len(msg) != 4):
+            self.logger.debug(funcname + ': invalid message')
+            return
+
+        [identity, command, uuid_ser, payload] = msg
+        (a, b) = reliable_struct.unpack(payload)
+        receiver = self.receivers.get(identity, None)
+        tnow = time.time()
+        if(command == b'unsub'):
+            if(receiver != None):
+                self.remove_receiver(identity)
+            return
+
+        if((receiver == None) or (command == b'sub')): # A new subscriber or one the publisher does not know anymore (timeout, restart)
+            uuid = uuid_ser.decode('utf-8')
+            n_last = self.packets_stream.get(uuid_ser, 0)
+            buffer = self.get_buffer(uuid_ser)
+            if((a == 0) or (a >= n_last)): # New or everything received
+                n_next = n_last + 1
+            elif((len(buffer) > 0) and (buffer[-1][0] <= (a + 1))): # The missing packets are still in the buffer
+                n_next = a + 1
+            else:
+                n_next = buffer[-1][0] if (len(buffer) > 0) else n_last + 1
+                self.packets_reported_lost += n_next - a - 1
+                b += n_next - a - 1 # The credit counts from the first packet sent
+
+            if(receiver != None):
+                self.remove_receiver(identity)
+            self.receivers[identity] = {'uuid':uuid, 'topics':self.get_topics(uuid), 'n_next':n_next, 'n_acked':n_next - 1, 'n_credit':b, 'tlast':tnow, 'tprogress':tnow}
+            self.subscribers.setdefault(uuid, set()).add(identity)
+            self.send_control(socket, identity, b'start', uuid_ser, n_next, 0)
+            self.logger.debug(funcname + ': subscriber ' + str(identity) + ' of ' + uuid + ' starts at ' + str(n_next))
+            return
+
+        receiver['tlast'] = tnow
+        receiver['n_credit'] = b
+        if(command == b'ack'):
+            if(a > receiver['n_acked']):
+                receiver['n_acked'] = a
+                receiver['tprogress'] = tnow
+            elif((receiver['n_next'] > (a + 1)) and ((tnow - receiver['tprogress']) > self.dt_rto)): # Packets or acks got lost
+                self.resend_from(receiver, a + 1)
+                receiver['tprogress'] = tnow
+        elif(command == b'nack'):
+            if((a - 1) > receiver['n_acked']):
+                receiver['n_acked'] = a - 1
+            self.resend_from(receiver, a)
+            receiver['tprogress'] = tnow
+
+
+    def resend_from(self, receiver, n):
+        """ The packets from n on are sent again to the subscriber
+        """
+        if(n < receiver['n_next']):
+            self.packets_retransmitted += receiver['n_next'] - n
+            receiver['n_next'] = n
+
+
+    def send_control(self, socket, identity, command, uuid_ser, a, b):
+        try:
+            socket.send_multipart([identity, command, uuid_ser, reliable_struct.pack(a, b)], zmq.NOBLOCK)
+        except zmq.ZMQError as e: # Full or disconnected, the subscriber asks again
+            self.logger.debug('send_control(): ' + str(e))
+
+
+    def send_packets(self, socket, identity):
+        """ Sends the packets of the send buffer to the subscriber identity, as far as its credit allows
+        """
+        receiver = self.receivers[identity]
+        topics = receiver['topics']
+        buffer = self.buffers.get(topics[0], None)
+        if(buffer == None):
+            return
+
+        with buffer.condition:
+            if(len(buffer) == 0):
+                return
+            n_oldest = buffer[-1][0]
+            n_next = receiver['n_next']
+            if(n_next < n_oldest): # Dropped from the full buffer
+                self.send_control(socket, identity, b'lost', topics[0], n_next, n_oldest - 1)
+                self.packets_reported_lost += n_oldest - n_next
+                receiver['n_credit'] += n_oldest - n_next # Until the ack of the subscriber counts the lost packets as well
+                n_next = n_oldest
+                receiver['n_next'] = n_next
+            n_newest = buffer[0][0]
+            n_end = min(n_newest, receiver['n_credit'])
+            packets = []
+            for n in range(n_next, n_end + 1):
+                packet = buffer[n_newest - n]
+                if(packet[0] != n): # Not contiguous, pub_data() clears the buffer before numbering a packet without buffering it
+                    self.logger.warning('send_packets(): packet ' + str(n) + ' is missing in the send buffer')
+                    break
+                packets.append(packet)
+
+        for [n, ts, frames, flags] in packets:
+            header = packet_header_struct.pack(packet_header_version, flags, len(frames), n, ts)
+            try:
+                socket.send_multipart([identity, topics[1], header] + frames, zmq.NOBLOCK, copy = False)
+            except zmq.ZMQError: # The subscriber is full or disconnected, sent again later
+                break
+            receiver['n_next'] = n + 1
+
+
+    def trim_buffers(self):
+        """ Removes the packets acknowledged by all subscribers from the send buffers
+        """
+        for uuid_ser in list(self.buffers.keys()):
+            buffer = self.buffers[uuid_ser]
+            identities = self.subscribers.get(uuid_ser.decode('utf-8'), ())
+            n_acked = [self.receivers[identity]['n_acked'] for identity in list(identities) if identity in self.receivers]
+            n_min = min(n_acked) if (len(n_acked) > 0) else None
+            with buffer.condition:
+                while((len(buffer) > 0) and ((n_min == None) or (buffer[-1][0] <= n_min))):
+                    buffer.pop()
+
+
+    def get_reliable_statistic(self, uuid):
+        """ Returns a dictionary with the number of subscribers, the
+        statistic of the send buffer (see
+        :func:`pymqdatastream.stream_deque.get_statistic`) of the stream
+        uuid and the packets sent again and reported lost to subscribers
+        """
+        statistic = {}
+        statistic['subscribers'] = len(self.subscribers.get(uuid, ()))
+        buffer = self.buffers.get(uuid.encode('utf-8'), None)
+        statistic['buffer'] = buffer.get_statistic() if (buffer != None) else None
+        statistic['retransmitted'] = self.packets_retransmitted
+        statistic['reported_lost'] = self.packets_reported_lost
+        return statistic
+
+
+    def get_credit(self):
+        """ Returns the highest packet number the subscriber accepts,
+        n_acked plus the window or, if the deque does not drop old
+        packets itself (policy 'block' or 'drop_newest'), plus its free space
+        """
+        free = self.window
+        if((self.deque.maxpackets != None) and (self.deque.policy in ('block', 'drop_newest'))):
+            free = min(free, self.deque.maxpackets - len(self.deque))
+
+        return self.n_acked + max(free, 0)
+
+
+    def send_command(self, socket, command, a, b):
+        """ Sends a command to the publisher without blocking
+
+        Returns:
+            False if the publisher is not connected (e.g. gone or restarting) or does not read, the next ack is sent as usual and a publisher which does not know the subscriber takes it as a subscription
+        """
+        try:
+            socket.send_multipart([command, self.filter_uuid_ser, reliable_struct.pack(a, b)], zmq.NOBLOCK)
+        except zmq.ZMQError as e:
+            self.logger.debug('send_command(): ' + str(command) + ': ' + str(e))
+            return False
+
+        return True
+
+
+    def send_ack(self, socket):
+        """ Sends an ack with the current credit if one is due
+        """
+        tnow = time.time()
+        credit = self.get_credit()
+        if(((self.packets_since_ack > 0) and ((tnow - self.tack) >= self.dt_ack)) or \
+           (self.packets_since_ack >= self.ack_every) or \
+           ((credit - self.credit_sent) >= self.ack_every) or \
+           ((credit > self.credit_sent) and (self.credit_sent <= self.n_acked)) or \
+           ((tnow - self.tack) >= self.dt_heartbeat)):
+            self.tack = tnow
+            if(self.send_command(socket, b'ack', self.n_acked, credit)):
+                self.credit_sent = credit
+                self.packets_since_ack = 0
+
+
+    def reliable_recv_thread(self, socket):
+        """ The thread of the subscriber, it puts the packets in order into
+        the deque (see :func:`pymqdatastream.zmq_socket.put_substream_data`),
+        requests missing packets and grants credit with its acks
+        """
+        funcname = 'reliable_recv_thread()'
+        poller = zmq.Poller()
+        poller.register(socket, zmq.POLLIN)
+        self.credit_sent = self.get_credit()
+        self.send_command(socket, b'sub', self.n_acked, self.credit_sent)
+        self.tack = time.time()
+        while True:
+            if(poller.poll(self.dt_ack * 1000)):
+                while True:
+                    try:
+                        recv = socket.recv_multipart(zmq.NOBLOCK, copy = self.serialiser.copy)
+                    except zmq.Again:
+                        break
+                    self.recv_reliable_message(socket, recv)
+                    self.send_ack(socket)
+
+            self.send_ack(socket)
+            try:
+                self.thread_queue.get(block = False)
+                break
+            except queue.Empty:
+                pass
+
+        self.send_command(socket, b'unsub', 0, 0)
+        socket.close(linger = 100) # The unsub waits at most 100 ms for the publisher
+        self.connected = False
+        self.logger.debug(funcname + ': Closed')
+
+
+    def recv_reliable_message(self, socket, recv):
+        """ Processes a message of the publisher, packets are put into the
+        deque if they are the next ones, a packet after a gap is dropped
+        and the missing packets are requested
+        """
+        topic = recv[0] if self.serialiser.copy else recv[0].bytes
+        if(topic == b'start'):
+            (n_next, b) = reliable_struct.unpack(recv[2] if self.serialiser.copy else recv[2].bytes)
+            if((self.n_acked > 0) and (n_next <= self.n_acked)): # The publisher restarted
+                self.n_last = None
+            # A new subscription or, if n_next > n_acked + 1, packets
+            # which are not in the buffer of the publisher anymore, they
+            # are counted as lost with the next packet
+            self.n_acked = n_next - 1
+            return
+        elif(topic == b'lost'): # Packets sent before arrived before, zmq keeps the order
+            (n_first, n_last) = reliable_struct.unpack(recv[2] if self.serialiser.copy else recv[2].bytes)
+            self.n_acked = max(self.n_acked, n_last)
+            return
+
+        try:
+            n = self.decode_packet_infos(recv)[1][0][0]
+        except Exception as e: # A malformed message must not stop the thread
+            self.packets_undecodable += 1
+            self.logger.warning('recv_reliable_message(): invalid message, dropping it: ' + str(e))
+            return
+        n_expected = self.n_acked + 1
+        if(n < n_expected):
+            self.packets_duplicate += 1
+            return
+        elif(n > n_expected): # A gap, the publisher sends again from n_expected on
+            tnow = time.time()
+            if((self.n_nack != n_expected) or ((tnow - self.tnack) > self.dt_rto)):
+                self.n_nack = n_expected
+                self.tnack = tnow
+                self.nacks += 1
+                self.send_command(socket, b'nack', n_expected, self.get_credit())
+            return
+
+        tirecv = time.time()
+        nbytes = sum([len(r) for r in recv])
+        if(self.do_statistic):
+            self.statistic['bytes_received'] += nbytes
+            self.statistic['packets_received'] += 1
+
+        if(self.backfilling): # Stream.backfill() puts the history into the deque at the same time
+            with self.deque.condition:
+                self.put_substream_data(recv, tirecv, nbytes)
+        else:
+            self.put_substream_data(recv, tirecv, nbytes)
+
+        self.n_acked = n
+        self.packets_since_ack += 1
+
+
+    def get_sequence_statistic(self):
+        """ The statistic of :func:`pymqdatastream.zmq_socket.get_sequence_statistic` and the number of retransmit requests (nacks)
+        """
+        statistic = super(reliable_zmq_socket, self).get_sequence_statistic()
+        statistic['nacks'] = self.nacks
+        return statistic
+
+
+    def get_info(self):
+        """ The socket info of :func:`pymqdatastream.zmq_socket.get_info` and the window of a publisher
+        """
+        info_dict = super(reliable_zmq_socket, self).get_info()
+        if(self.socket_type == 'reliable'):
+            info_dict['window'] = self.window
+        return info_dict
@@ -0,0 +1,172 @@
+"""
+.. module:: serialiser
+   :platform: Unix, Windows
+   :synopsis: Registry of the serialisers used to encode the data of Streams
+
+This module holds the serialisers (codecs) used by
+:class:`pymqdatastream.zmq_socket` to encode the data of a pubstream
+and to decode it in a substream. Every pubstream declares its
+serialiser with the data_format in its info dict (see
+:func:`pymqdatastream.Stream.get_info_dict`), a subscribing Stream
+picks the matching serialiser in
+:func:`pymqdatastream.Stream.connect_stream`.
+
+A serialiser converts the data into a list of zmq frames
+(:func:`Serialiser.dumps`) and a list of frames back into data
+(:func:`Serialiser.loads`). New serialisers can be added with
+:func:`register_serialiser`.
+
+"""
+
+import json
+import ubjson
+import logging
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+logger = logging.getLogger('serialiser')
+
+
+class Serialiser(object):
+    """ A serialiser for the data of a Stream
+
+    Args:
+       name (str): The name of the serialiser, this is the data_format advertised in the stream info dict
+       dumps: Function converting the data into a list of frames (bytes or buffer objects)
+       loads: Function converting a list of received frames into data
+       copy (bool): If False the frames are received as zmq.Frame objects without copying and loads has to use the .bytes or .buffer attributes [default=True]
+    """
+    def __init__(self, name, dumps, loads, copy = True):
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+        self.copy = copy
+
+    def __str__(self):
+        return self.__class__.__name__ + ';name:' + self.name + ';copy:' + str(self.copy)
+
+
+def dumps_ubjson(data):
+    return [ubjson.dumpb(data)]
+
+
+def loads_ubjson(frames):
+    return ubjson.loadb(frames[0])
+
+
+def dumps_json(data):
+    return [json.dumps(data).encode('utf-8')]
+
+
+def loads_json(frames):
+    return json.loads(frames[0].decode('utf-8'))
+
+
+def dumps_msgpack(data):
+    return [msgpack.packb(data, use_bin_type=True)]
+
+
+def loads_msgpack(frames):
+    return msgpack.unpackb(frames[0], raw=False)
+
+
+def dumps_raw(data):
+    """ Sends bytes as they are, a list of byte strings is joined
+    """
+    if(isinstance(data, list)):
+        data = b''.join(data)
+    return [bytes(data)]
+
+
+def loads_raw(frames):
+    return frames[0]
+
+
+def dumps_ndarray(data):
+    """Serialises a numpy array into a header and the raw data
+    buffer. The header is a ubjson encoded list of the form [dtype_str,
+    shape], the data buffer is the array itself, which is later sent by
+    zmq without copying. The array must not be changed after it has been
+    handed over to the publisher.
+
+    Args:
+       data: numpy array or object convertible with np.asarray (e.g. a list of rows)
+    Returns:
+       [header_ser, data_buffer]
+
+    """
+    import numpy as np # Imported when needed, numpy is not needed by the other serialisers
+    data = np.ascontiguousarray(data)
+    header_ser = ubjson.dumpb([data.dtype.str, list(data.shape)])
+    return [header_ser, data]
+
+
+def loads_ndarray(frames):
+    """Converts the frames created by dumps_ndarray into a numpy
+    array. The returned array is a read-only view of the buffer of the
+    zmq.Frame, no data is copied.
+
+    """
+    import numpy as np
+    [dtype_str, shape] = ubjson.loadb(frames[0].bytes)
+    return np.frombuffer(frames[1].buffer, dtype = np.dtype(dtype_str)).reshape(shape)
+
+
+serialisers = {} # The registry, data_format:Serialiser
+default_data_format = 'ubjson'
+
+
+def register_serialiser(serialiser, aliases = []):
+    """ Adds a serialiser to the registry
+
+    Args:
+       serialiser: Serialiser object
+       aliases: List of additional data_format names the serialiser is used for
+    """
+    serialisers[serialiser.name] = serialiser
+    for alias in aliases:
+        serialisers[alias] = serialiser
+
+
+def get_serialiser(data_format):
+    """ Returns the serialiser for data_format. Streams of older versions
+    of pymqdatastream without a data_format (None) are ubjson, which was
+    the only format used then.
+
+    Args:
+       data_format (str): The data_format of the stream
+    Returns:
+       Serialiser object
+    Raises:
+       Exception if no serialiser is registered for data_format, see :func:`has_serialiser`
+    """
+    if(data_format == None):
+        return serialisers[default_data_format]
+
+    try:
+        return serialisers[data_format]
+    except KeyError:
+        raise Exception('get_serialiser(): unknown data_format ' + str(data_format) + ', known formats: ' + str(get_data_formats()))
+
+
+def has_serialiser(data_format):
+    """ Returns True if a serialiser is registered for data_format (a name or an alias), None is ubjson
+    """
+    return (data_format == None) or (data_format in serialisers)
+
+
+def get_data_formats():
+    """ Returns a list of the names of all registered serialisers
+    """
+    return sorted(set([s.name for s in serialisers.values()]))
+
+
+# 'py_json' is the data_format older versions advertised, the data was ubjson nevertheless
+register_serialiser(Serialiser('ubjson', dumps_ubjson, loads_ubjson), aliases = ['py_json'])
+register_serialiser(Serialiser('json', dumps_json, loads_json))
+register_serialiser(Serialiser('raw', dumps_raw, loads_raw))
+register_serialiser(Serialiser('ndarray', dumps_ndarray, loads_ndarray, copy = False))
+if(msgpack is not None):
+    register_serialiser(Serialiser('msgpack', dumps_msgpack, loads_msgpack))
@@ -0,0 +1,176 @@
+"""
+.. module:: shmring
+   :platform: Unix, Windows
+   :synopsis: A shared memory ring buffer for streams on the same host
+
+A pubstream created with transport='shm' (see
+:func:`pymqdatastream.DataStream.add_pub_stream`) writes its data as
+fixed dtype records into a :class:`shm_ringbuffer`. Only the position
+of the new records is published via zmq, a substream on the same host
+attaches to the shared memory and reads the records with its own
+cursor. A substream missing wakeup packets (e.g. because of a full zmq
+queue) still gets all records as long as they have not been
+overwritten by the publisher.
+
+The shared memory starts with a header of header_len uint64 values:
+[write_count, num_records, num_columns], followed by the records, a
+num_records x num_columns array of dtype. Needs python >= 3.8
+(multiprocessing.shared_memory).
+
+"""
+
+import logging
+import numpy as np
+import ubjson
+try:
+    from multiprocessing import shared_memory
+    from multiprocessing import resource_tracker
+except ImportError:
+    shared_memory = None
+
+logger = logging.getLogger('shmring')
+header_len = 8 # Number of uint64 header values
+
+
+class shm_ringbuffer(object):
+    """ A ring buffer of records in shared memory
+
+    Args:
+       name (str): Name of the shared memory, None creates a unique name (create=True only)
+       num_records (int): Number of records in the ring buffer [default=65536]
+       num_columns (int): Number of values per record, typically the number of variables of the stream
+       dtype: numpy dtype of the values [default='<f8']
+       create (bool): True creates the shared memory (publisher), False attaches to it (subscriber)
+       untrack (bool): subscriber only, unregister the memory from the resource tracker, which would otherwise remove it when the subscribing process exits. Has to be False if publisher and subscriber share the resource tracker (e.g. are in the same process) [default=True]
+       logging_level:
+    """
+    def __init__(self, name = None, num_records = 65536, num_columns = 1, dtype = '<f8', create = True, untrack = True, logging_level = 'INFO'):
+        funcname = '__init__()'
+        self.logger = logging.getLogger(self.__class__.__name__)
+        if((logging_level == 'DEBUG') | (logging_level == logging.DEBUG)):
+            self.logger.setLevel(logging.DEBUG)
+        elif((logging_level == 'INFO') | (logging_level == logging.INFO)):
+            self.logger.setLevel(logging.INFO)
+        else:
+            self.logger.setLevel(logging.CRITICAL)
+
+        if(shared_memory == None):
+            raise Exception(funcname + ': shared memory transport needs python >= 3.8')
+
+        self.dtype = np.dtype(dtype)
+        self.num_records = num_records
+        self.num_columns = num_columns
+        self.create = create
+        header_bytes = header_len * 8
+        nbytes = header_bytes + num_records * num_columns * self.dtype.itemsize
+        if(create):
+            self.shm = shared_memory.SharedMemory(name = name, create = True, size = nbytes)
+        else:
+            self.shm = shared_memory.SharedMemory(name = name)
+            # The resource tracker would unlink the memory when this process exits
+            if(untrack):
+                try:
+                    resource_tracker.unregister(self.shm._name, 'shared_memory')
+                except Exception as e:
+                    self.logger.debug(funcname + ': Could not unregister from resource tracker: ' + str(e))
+
+        self.name = self.shm.name
+        self.header = np.ndarray((header_len,), dtype = np.uint64, buffer = self.shm.buf)
+        self.records = np.ndarray((num_records, num_columns), dtype = self.dtype, buffer = self.shm.buf, offset = header_bytes)
+        if(create):
+            self.header[:] = 0
+            self.header[1] = num_records
+            self.header[2] = num_columns
+
+        self.cursor = int(self.header[0]) # The read position of a subscriber
+        self.records_lost = 0 # Records overwritten before they were read
+        self.logger.debug(funcname + ': ' + str(self))
+
+
+    def write(self, data):
+        """ Writes records into the ring buffer
+
+        Args:
+           data: A list of rows or 2D array with num_columns values per row
+        Returns:
+           [start, n]: The write count of the first record and the number of records written
+        """
+        data = np.asarray(data, dtype = self.dtype).reshape(-1, self.num_columns)
+        start = int(self.header[0])
+        if(len(data) > self.num_records): # Only the last records fit
+            start += len(data) - self.num_records
+            data = data[-self.num_records:]
+
+        n = len(data)
+        ind = start % self.num_records
+        nfirst = min(n, self.num_records - ind)
+        self.records[ind:ind + nfirst] = data[:nfirst]
+        self.records[:n - nfirst] = data[nfirst:]
+        # Publish the new records after they have been written
+        self.header[0] = start + n
+        return [start, n]
+
+
+    def read(self, end = None):
+        """ Reads the records from the cursor up to end and moves the cursor to end
+
+        Args:
+           end: Write count up to which the records are read, None reads all records written so far
+        Returns:
+           data: num_records x num_columns numpy array (a copy)
+        """
+        funcname = 'read()'
+        if(end == None):
+            end = int(self.header[0])
+
+        if(end <= self.cursor):
+            return np.zeros((0, self.num_columns), dtype = self.dtype)
+
+        start = max(self.cursor, end - self.num_records)
+        data = self.records[np.arange(start, end) % self.num_records]
+        # Records overwritten by the publisher while copying are discarded
+        start_valid = min(int(self.header[0]) - self.num_records, end)
+        if(start_valid > start):
+            data = data[start_valid - start:]
+            start = start_valid
+
+        if(start > self.cursor):
+            self.records_lost += start - self.cursor
+            self.logger.debug(funcname + ': Lost ' + str(start - self.cursor) + ' records')
+
+        self.cursor = end
+        return data
+
+
+    def loads(self, frames):
+        """ The loads function of the serialiser of a shm substream, the
+        frames contain the ubjson encoded [start, n] of the publisher
+        """
+        [start, n] = ubjson.loadb(frames[0])
+        return self.read(start + n)
+
+
+    def get_info(self):
+        """ Returns a dictionary with the information needed to attach to the ring buffer
+        """
+        info_dict = {}
+        info_dict['name'] = self.name
+        info_dict['num_records'] = self.num_records
+        info_dict['num_columns'] = self.num_columns
+        info_dict['dtype'] = self.dtype.str
+        return info_dict
+
+
+    def close(self):
+        """ Detaches from the shared memory, the publisher also removes it
+        """
+        # Release the numpy views, otherwise the memory cannot be closed
+        self.header = None
+        self.records = None
+        self.shm.close()
+        if(self.create):
+            self.shm.unlink()
+
+
+    def __str__(self):
+        return self.__class__.__name__ + ';name:' + self.name + ';num_records:' + str(self.num_records) + ';num_columns:' + str(self.num_columns) + ';dtype:' + self.dtype.str
@@ -0,0 +1,133 @@
+"""
+.. module:: telemetry
+   :platform: Unix, Windows
+   :synopsis: Rolling throughput and latency statistics of streams
+
+A :class:`stream_telemetry` object is kept by the zmq_socket for every
+stream it sends or receives. The packets are counted in buckets of
+dt_bucket seconds, the statistics (packets/s, bytes/s and the
+histogram of the latency tr - ts) are calculated over the buckets of
+the last window seconds. The statistics of all streams of a datastream
+are requested with {'get':'stats'} at its control socket, see
+:func:`pymqdatastream.DataStream.get_stats`.
+
+The latency histogram has logarithmic bins with
+latency_bins_per_decade bins per decade between latency_min and
+latency_max, the first bin holds all latencies below latency_min
+(including negative latencies caused by unsynchronised clocks), the
+last bin all latencies above latency_max. Note that latencies between
+hosts are only meaningful if their clocks are synchronised.
+
+"""
+
+import math
+import time
+import bisect
+import itertools
+
+latency_min = 1e-6
+latency_max = 1e3
+latency_bins_per_decade = 4
+num_latency_bins = int(round(math.log10(latency_max / latency_min) * latency_bins_per_decade)) + 2
+# The upper edges of the histogram bins, the last bin has no upper edge
+latency_edges = [latency_min * 10**(i / latency_bins_per_decade) for i in range(num_latency_bins - 1)]
+
+
+def get_latency_bin(latency):
+    """ Returns the index of the histogram bin of latency
+    """
+    if(latency <= latency_min):
+        return 0
+
+    return min(int(math.log10(latency / latency_min) * latency_bins_per_decade) + 1, num_latency_bins - 1)
+
+
+class stream_telemetry(object):
+    """ Rolling statistic of the packets of one stream
+
+    Args:
+       window (float): Time in seconds the statistic is calculated over [default=10]
+       dt_bucket (float): Time resolution in seconds of the rolling window [default=1]
+    """
+    def __init__(self, window = 10.0, dt_bucket = 1.0):
+        self.window = window
+        self.dt_bucket = dt_bucket
+        self.num_buckets = max(1, int(round(window / dt_bucket)))
+        self.tstart = time.time()
+        # Plain lists, the buckets are small and numpy is not needed by the core
+        self.bucket_ids = [None] * self.num_buckets # The time index of every bucket
+        self.packets = [0] * self.num_buckets
+        self.nbytes = [0] * self.num_buckets
+        self.latency_sum = [0.0] * self.num_buckets
+        self.latency_max = [0.0] * self.num_buckets
+        self.latency_hist = [[0] * num_latency_bins for i in range(self.num_buckets)]
+        self.packets_total = 0
+        self.bytes_total = 0
+
+
+    def update(self, t, nbytes, latency = None):
+        """ Adds a packet to the statistic
+
+        Args:
+           t: Time the packet was sent/received
+           nbytes: Size of the packet
+           latency: Latency of the packet (tr - ts), None for sent packets
+        """
+        bucket_id = int(t / self.dt_bucket)
+        i = bucket_id % self.num_buckets
+        if(self.bucket_ids[i] != bucket_id): # A new bucket, forget the old data
+            self.bucket_ids[i] = bucket_id
+            self.packets[i] = 0
+            self.nbytes[i] = 0
+            self.latency_sum[i] = 0.0
+            self.latency_max[i] = 0.0
+            self.latency_hist[i] = [0] * num_latency_bins
+
+        self.packets[i] += 1
+        self.nbytes[i] += nbytes
+        self.packets_total += 1
+        self.bytes_total += nbytes
+        if(latency != None):
+            self.latency_sum[i] += latency
+            self.latency_max[i] = max(self.latency_max[i], latency)
+            self.latency_hist[i][get_latency_bin(latency)] += 1
+
+
+    def get_stats(self, tnow = None):
+        """ Returns the statistic of the last window seconds
+
+        Returns:
+           stats: dictionary with packets_total, bytes_total,
+           packets_per_s, bytes_per_s and for received packets the
+           latency dictionary with mean, max, the percentiles p50, p90,
+           p99 (upper edges of the histogram bins) and the histogram
+           counts hist with the upper bin edges edges
+        """
+        if(tnow == None):
+            tnow = time.time()
+
+        bucket_now = int(tnow / self.dt_bucket)
+        valid = [i for i, b in enumerate(self.bucket_ids) if (b != None) and ((bucket_now - b) < self.num_buckets)]
+        dt = max(min(self.window, tnow - self.tstart), self.dt_bucket)
+        packets = sum([self.packets[i] for i in valid])
+        stats = {}
+        stats['packets_total'] = self.packets_total
+        stats['bytes_total'] = self.bytes_total
+        stats['packets_per_s'] = packets / dt
+        stats['bytes_per_s'] = float(sum([self.nbytes[i] for i in valid])) / dt
+        hist = [sum(counts) for counts in zip(*[self.latency_hist[i] for i in valid])]
+        nlatency = sum(hist)
+        if(nlatency > 0):
+            latency = {}
+            latency['mean'] = sum([self.latency_sum[i] for i in valid]) / nlatency
+            latency['max'] = max([self.latency_max[i] for i in valid])
+            cumsum = list(itertools.accumulate(hist))
+            for name, q in [('p50', 0.5), ('p90', 0.9), ('p99', 0.99)]:
+                ibin = bisect.bisect_left(cumsum, q * nlatency)
+                latency[name] = latency_edges[ibin] if ibin < len(latency_edges) else latency['max']
+
+            latency['hist'] = hist
+            latency['edges'] = latency_edges
+            stats['latency'] = latency
+
+        return stats
@@ -0,0 +1,194 @@
+"""
+.. module:: views
+   :platform: Unix, Windows
+   :synopsis: Decimated and aggregated views of pubstreams, computed by the publisher
+
+A subscriber which does not need the full rate of a stream (e.g. a
+remote plot) requests a view of the stream with {'get':'view'} at the
+control socket of the publishing datastream (see
+:func:`pymqdatastream.DataStream.subscribe_view`). The publisher
+computes the view once in :func:`pymqdatastream.Stream.pub_data` and
+publishes it as an additional pubstream, clients asking for the same
+view share it. A view without subscribers for timeout seconds is
+removed again.
+
+View types (the view dictionary of the request):
+
+   * {'type':'nth', 'n':n}: every nth packet of the stream
+   * {'type':'bucket', 'dt':dt}: the rows of the packets of every dt seconds are aggregated into one row [t, count, min_0, max_0, mean_0, min_1, ...], t is the start of the bucket, count the number of rows and min_i, max_i, mean_i the statistic of variable i. The data of the stream has to be a list of rows (or a 2D array) of numbers. A bucket is published with the first packet after its end.
+
+"""
+
+import time
+import math
+import logging
+
+logger = logging.getLogger('views')
+
+view_types = ['nth', 'bucket']
+default_view_timeout = 30.0 # Time in seconds a view without subscribers is kept
+
+
+def check_view(view):
+    """ Checks a view dictionary and returns it in its normalised form,
+    the form is the key of the view, two requests of the same view get
+    the same view stream
+
+    Args:
+       view (dict): The requested view, e.g. {'type':'nth','n':10}
+    Returns:
+       view: The normalised view dictionary
+    Raises:
+       ValueError if the view is invalid
+    """
+    view_type = view.get('type', None)
+    if(view_type == 'nth'):
+        n = int(view['n'])
+        if(n < 1):
+            raise ValueError('n has to be >= 1')
+        return {'type':'nth', 'n':n}
+    elif(view_type == 'bucket'):
+        dt = float(view['dt'])
+        if(not(dt > 0)):
+            raise ValueError('dt has to be > 0')
+        return {'type':'bucket', 'dt':dt}
+    else:
+        raise ValueError('unknown view type ' + str(view_type) + ', known types: ' + str(view_types))
+
+
+def get_view_key(uuid, view):
+    """ Returns the key of the (normalised) view of the stream with uuid
+    """
+    if(view['type'] == 'nth'):
+        return (uuid, 'nth', view['n'])
+    else:
+        return (uuid, 'bucket', view['dt'])
+
+
+def get_view_name(name, view):
+    """ Returns the name of the view stream of the stream name
+    """
+    if(view['type'] == 'nth'):
+        return name + ' (every ' + str(view['n']) + '. packet)'
+    else:
+        return name + ' (' + str(view['dt']) + ' s min/max/mean)'
+
+
+def get_view_variable_names(names, view):
+    """ Returns the names of the variables of the view stream of a stream with the variable names
+    """
+    if(view['type'] == 'nth'):
+        return list(names)
+
+    view_names = ['t', 'count']
+    for name in names:
+        view_names.extend([name + ' min', name + ' max', name + ' mean'])
+
+    return view_names
+
+
+class stream_view(object):
+    """ Computes a view of a pubstream and publishes it with the view stream
+
+    Args:
+       stream: The pubstream of the view (:class:`pymqdatastream.Stream`)
+       view (dict): The normalised view, see :func:`check_view`
+       key: The key of the view, see :func:`get_view_key`
+       source: The pubstream the view is derived from
+       remove_function: Function called with the view as argument when the view expired, e.g. :func:`pymqdatastream.DataStream.rem_view`
+       timeout (float): The view expires if it had no subscriber for timeout seconds [default=30]
+    """
+    def __init__(self, stream, view, key, source = None, remove_function = None, timeout = default_view_timeout):
+        self.stream = stream
+        self.view = view
+        self.key = key
+        self.source = source
+        self.remove_function = remove_function
+        self.timeout = timeout
+        self.tsubscribed = time.time() # The last time the view stream had a subscriber
+        self.expired = False
+        self.packets = 0 # nth: Packets since the last published packet
+        self.tbucket = None # bucket: Start of the current bucket
+        self.bucket = None # bucket: [count, min, max, sum] of the current bucket
+
+
+    def process(self, data):
+        """ Processes a packet of the stream the view is derived from,
+        called by :func:`pymqdatastream.Stream.pub_data`. Returns False if
+        the view has expired.
+
+        Args:
+           data: The data of the packet
+        """
+        funcname = 'stream_view.process()'
+        tnow = time.time()
+        if(self.stream.has_subscriber()):
+            self.tsubscribed = tnow
+        elif((tnow - self.tsubscribed) > self.timeout):
+            self.expired = True
+            return False
+        else: # Nobody listens at the moment, nothing to compute
+            self.packets = 0
+            self.tbucket = None
+            self.bucket = None
+            return True
+
+        try:
+            if(self.view['type'] == 'nth'):
+                self.packets += 1
+                if(self.packets >= self.view['n']):
+                    self.packets = 0
+                    self.stream.pub_data(data)
+            else:
+                self.process_bucket(data, tnow)
+        except (ValueError, TypeError, IndexError) as e:
+            logger.warning(funcname + ': ' + str(self.key) + ' cannot be computed, removing the view: ' + str(e))
+            self.expired = True
+            return False
+
+        return True
+
+
+    def process_bucket(self, data, tnow):
+        """ Adds the rows of data to the current bucket, a finished bucket is published first
+        """
+        dt = self.view['dt']
+        if((self.tbucket != None) and (tnow >= self.tbucket + dt)):
+            self.publish_bucket()
+            self.tbucket = None
+
+        if(self.tbucket == None):
+            self.tbucket = math.floor(tnow / dt) * dt
+            self.bucket = None
+
+        for row in data:
+            values = [float(v) for v in row]
+            bucket = self.bucket
+            if(bucket == None):
+                self.bucket = [1, list(values), list(values), list(values)]
+                continue
+
+            if(len(values) != len(bucket[1])):
+                raise ValueError('rows of different length')
+
+            bucket[0] += 1
+            for i,v in enumerate(values):
+                if(v < bucket[1][i]):
+                    bucket[1][i] = v
+                if(v > bucket[2][i]):
+                    bucket[2][i] = v
+                bucket[3][i] += v
+
+
+    def publish_bucket(self):
+        """ Publishes the current bucket as one row
+        """
+        if(self.bucket == None):
+            return
+
+        [count, vmin, vmax, vsum] = self.bucket
+        row = [self.tbucket, count]
+        for i in range(len(vmin)):
+            row.extend([vmin[i], vmax[i], vsum[i] / count])
+
+        self.stream.pub_data([row])